@@ -3,6 +3,7 @@ from logging.config import fileConfig
 from sqlalchemy import engine_from_config
 from sqlalchemy import pool
 from app.models.student import StudentModel  # Import your models here to register them
+from app.models.score_stats import ScoreStatsModel
 
 from alembic import context
 from app.core.database import Base
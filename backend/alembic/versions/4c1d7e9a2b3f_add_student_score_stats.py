@@ -0,0 +1,61 @@
+"""add student_score_stats
+
+Revision ID: 4c1d7e9a2b3f
+Revises: 9739e7e262c7, cf3ee0980c2e
+Create Date: 2026-10-18 09:12:41.208133
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4c1d7e9a2b3f'
+down_revision: Union[str, Sequence[str], None] = ('9739e7e262c7', 'cf3ee0980c2e')
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('student_score_stats',
+    sa.Column('scope', sa.String(length=100), nullable=False),
+    sa.Column('subject', sa.String(length=20), nullable=False),
+    sa.Column('student_count', sa.BigInteger(), nullable=False),
+    sa.Column('excellent_count', sa.BigInteger(), nullable=False),
+    sa.Column('average_count', sa.BigInteger(), nullable=False),
+    sa.Column('poor_count', sa.BigInteger(), nullable=False),
+    sa.Column('score_count', sa.BigInteger(), nullable=False),
+    sa.Column('score_sum', sa.Float(), nullable=False),
+    sa.Column('min_score', sa.Float(), nullable=True),
+    sa.Column('max_score', sa.Float(), nullable=True),
+    sa.PrimaryKeyConstraint('scope', 'subject')
+    )
+    # Seed from the existing rows; afterwards the repository keeps it up to date
+    op.execute("""
+        INSERT INTO student_score_stats (scope, subject, student_count, excellent_count, average_count,
+                                         poor_count, score_count, score_sum, min_score, max_score)
+        SELECT CASE WHEN GROUPING(s.hometown) = 1 THEN '' ELSE s.hometown END,
+               v.subject,
+               count(*),
+               count(*) FILTER (WHERE v.score >= 8),
+               count(*) FILTER (WHERE v.score >= 5 AND v.score < 8),
+               count(*) FILTER (WHERE v.score < 5),
+               count(v.score),
+               COALESCE(sum(v.score), 0),
+               min(v.score),
+               max(v.score)
+        FROM students s
+        CROSS JOIN LATERAL (VALUES ('math', s.math_score),
+                                   ('english', s.english_score),
+                                   ('literature', s.literature_score)) AS v(subject, score)
+        GROUP BY GROUPING SETS ((v.subject), (s.hometown, v.subject))
+        HAVING GROUPING(s.hometown) = 1 OR s.hometown <> ''
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('student_score_stats')
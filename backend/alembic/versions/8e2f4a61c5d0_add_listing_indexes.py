@@ -0,0 +1,53 @@
+"""add listing indexes
+
+Revision ID: 8e2f4a61c5d0
+Revises: 4c1d7e9a2b3f
+Create Date: 2026-10-18 10:03:27.551890
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e2f4a61c5d0'
+down_revision: Union[str, Sequence[str], None] = '4c1d7e9a2b3f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, columns) pairs, mirroring STUDENT_INDEXES in app/models/student.py
+INDEXES = [
+    ('ix_students_first_name_student_id', ['first_name', 'student_id']),
+    ('ix_students_last_name_student_id', ['last_name', 'student_id']),
+    ('ix_students_hometown_student_id', ['hometown', 'student_id']),
+    ('ix_students_math_score_student_id', ['math_score', 'student_id']),
+    ('ix_students_english_score_student_id', ['english_score', 'student_id']),
+    ('ix_students_literature_score_student_id', ['literature_score', 'student_id']),
+]
+# (index name, column) pairs for prefix filters, mirroring STUDENT_PATTERN_INDEXES
+PATTERN_INDEXES = [
+    ('ix_students_student_id_pattern', 'student_id'),
+    ('ix_students_first_name_pattern', 'first_name'),
+    ('ix_students_last_name_pattern', 'last_name'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Duplicates the primary key index
+    op.drop_index(op.f('ix_students_student_id'), table_name='students')
+    for name, columns in INDEXES:
+        op.create_index(name, 'students', columns, unique=False)
+    for name, column in PATTERN_INDEXES:
+        op.create_index(name, 'students', [column], unique=False, postgresql_ops={column: 'varchar_pattern_ops'})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, _ in reversed(PATTERN_INDEXES):
+        op.drop_index(name, table_name='students')
+    for name, _ in reversed(INDEXES):
+        op.drop_index(name, table_name='students')
+    op.create_index(op.f('ix_students_student_id'), 'students', ['student_id'], unique=False)
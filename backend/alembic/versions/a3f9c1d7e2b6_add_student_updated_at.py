@@ -0,0 +1,46 @@
+"""add student updated_at
+
+Revision ID: a3f9c1d7e2b6
+Revises: d71b3c0e5a94
+Create Date: 2026-10-18 14:12:40.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3f9c1d7e2b6'
+down_revision: Union[str, Sequence[str], None] = 'd71b3c0e5a94'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('students', sa.Column('updated_at', sa.DateTime(timezone=True),
+                                        server_default=sa.text('now()'), nullable=False))
+    # Every UPDATE stamps the row, whether it comes from the ORM, a Core statement or ON CONFLICT
+    op.execute("""
+        CREATE FUNCTION students_set_updated_at() RETURNS trigger AS $$
+        BEGIN
+            NEW.updated_at = now();
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER students_set_updated_at BEFORE UPDATE ON students
+        FOR EACH ROW EXECUTE FUNCTION students_set_updated_at()
+    """)
+    op.create_index('ix_students_updated_at_student_id', 'students', ['updated_at', 'student_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_students_updated_at_student_id', table_name='students')
+    op.execute('DROP TRIGGER students_set_updated_at ON students')
+    op.execute('DROP FUNCTION students_set_updated_at()')
+    op.drop_column('students', 'updated_at')
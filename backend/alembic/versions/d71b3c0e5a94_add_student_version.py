@@ -0,0 +1,38 @@
+"""add student version
+
+Revision ID: d71b3c0e5a94
+Revises: 8e2f4a61c5d0
+Create Date: 2026-10-18 11:26:05.774310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd71b3c0e5a94'
+down_revision: Union[str, Sequence[str], None] = '8e2f4a61c5d0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('students', sa.Column('version', sa.Integer(), server_default=sa.text('1'), nullable=False))
+    # Table-wide change counter for listing ETags: one row written in each write transaction,
+    # so it replicates with the data (a standby only sees sequence values as WAL-logged)
+    op.create_table(
+        'students_version',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('version', sa.BigInteger(), server_default=sa.text('0'), nullable=False),
+        sa.CheckConstraint('id = 1', name='ck_students_version_single_row'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('students_version')
+    op.drop_column('students', 'version')
@@ -0,0 +1,71 @@
+"""Maintenance commands.
+
+Usage (from /backend):
+    python -m app.cli import-csv app/seeds/students_100.csv --chunk-size 5000
+    python -m app.cli import-csv big_roster.csv --no-copy
+    python -m app.cli import-csv big_roster.csv --measure-memory
+    python -m app.cli rebuild-score-stats
+"""
+import argparse
+import asyncio
+
+from app.core.database import session_scope
+from app.repositories.student_repo import StudentRepository
+from app.services.student_service import StudentService
+
+
+async def import_csv(args) -> int:
+    service = StudentService(student_repo=StudentRepository(session_scope))
+    result = await service.import_students(args.file_path, chunk_size=args.chunk_size,
+                                           use_copy=False if args.no_copy else None,
+                                           measure_memory=args.measure_memory)
+    if not result.success:
+        print(f"Import failed: {result.error}")
+        return 1
+    stats = result.data[0]
+    peak = stats['peak_memory_bytes']
+    peak_text = f", peak memory {peak / (1024 * 1024):.1f} MiB" if peak is not None else ""
+    print(f"Imported {stats['rows']} students via {stats['method']} in {stats['seconds']}s "
+          f"({stats['rows_per_second']} rows/s{peak_text})")
+    return 0
+
+
+async def rebuild_score_stats(args) -> int:
+    service = StudentService(student_repo=StudentRepository(session_scope))
+    result = await service.rebuild_score_stats()
+    if not result.success:
+        print(f"Rebuild failed: {result.error}")
+        return 1
+    if not result.data:
+        print("student_score_stats rebuilt, no drift found")
+        return 0
+    print(f"student_score_stats rebuilt, {len(result.data)} group(s) had drifted:")
+    for drift in result.data:
+        print(f"  {drift['scope'] or '(all students)'}/{drift['subject']}: stored={drift['stored']} recomputed={drift['recomputed']}")
+    return 2 if args.check else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser("import-csv", help="stream a roster CSV into the students table")
+    import_parser.add_argument("file_path")
+    import_parser.add_argument("--chunk-size", type=int, default=None, help="defaults to IMPORT_CHUNK_SIZE")
+    import_parser.add_argument("--no-copy", action="store_true",
+                               help="use multi-row INSERT instead of PostgreSQL COPY")
+    import_parser.add_argument("--measure-memory", action="store_true",
+                               help="report peak memory (tracemalloc; slows the import)")
+    import_parser.set_defaults(handler=import_csv)
+
+    rebuild_parser = commands.add_parser("rebuild-score-stats",
+                                         help="recompute student_score_stats and report drift")
+    rebuild_parser.add_argument("--check", action="store_true", help="exit with status 2 if drift was found")
+    rebuild_parser.set_defaults(handler=rebuild_score_stats)
+
+    args = parser.parse_args()
+    return asyncio.run(args.handler(args))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
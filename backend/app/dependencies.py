@@ -1,10 +1,13 @@
-from fastapi import Depends
-from sqlalchemy.ext.asyncio import AsyncSession
 from app.repositories.student_repo import StudentRepository 
 from app.services.student_service import StudentService
-from app.core.database import get_db 
+from app.core.database import session_scope, replica_session_scope
+from app.core.config import get_settings
 
 
-async def get_student_service(db: AsyncSession = Depends(get_db)) -> StudentService:
-    repo = StudentRepository(session_factory=lambda: db)
-    return StudentService(student_repo=repo)
+async def get_student_service() -> StudentService:
+    # Each repository operation opens and closes its own session_scope. The repository
+    # is built per request, so reads stick to the primary after that request writes.
+    settings = get_settings()
+    repo = StudentRepository(session_factory=session_scope, settings=settings,
+                             read_session_factory=replica_session_scope)
+    return StudentService(student_repo=repo, settings=settings)
@@ -1,23 +1,34 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from app.utils.responses import FastJSONResponse
 from app.routes.student_router import router
+from app.routes.metrics_router import router as metrics_router
+from app.core.config import get_settings
 
-app = FastAPI(title="Student Management API")
+settings = get_settings()
+
+app = FastAPI(title="Student Management API", default_response_class=FastJSONResponse)
 
 # Configure CORS to allow frontend requests
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["http://localhost:5173", "http://localhost:3000", "http://127.0.0.1:5173"],
+    allow_origins=settings.cors_origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
 app.include_router(router)
+app.include_router(metrics_router)
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    if settings.workers > 1:
+        # Multiple workers need the import string so each process builds its own app; each
+        # then has its own caches, which the repository only uses when that is safe
+        uvicorn.run("app.main:app", host=settings.host, port=settings.port, workers=settings.workers)
+    else:
+        uvicorn.run(app, host=settings.host, port=settings.port)
 
 
 #------------------------------------import data to db script------------------------------------
@@ -1,31 +1,84 @@
 from app.models.student import StudentModel
 from app.models.student_model import StudentModel as Student
-from datetime import datetime
-
-def to_entity(domain: Student) -> StudentModel:
-    dob = None
-    if domain.dob:
-        try:
-            dob = datetime.strptime(domain.dob, '%d/%m/%Y').date()
-        except (ValueError, TypeError):
+from datetime import date, datetime
+import re
+
+# Columns copied one-to-one between the domain model and the entity (dob is converted)
+COPIED_FIELDS = ('student_id', 'first_name', 'last_name', 'email', 'hometown',
+                 'math_score', 'english_score', 'literature_score')
+
+
+# The patterns strptime uses for '%d/%m/%Y', so the same strings are accepted and rejected
+_DMY = re.compile(r'(3[01]|[12]\d|0[1-9]|[1-9]| [1-9])/(1[0-2]|0[1-9]|[1-9])/(\d\d\d\d)')
+
+
+def _parse_dmy(value: str) -> date:
+    match = _DMY.fullmatch(value)
+    if not match:
+        raise ValueError(f"not a dd/mm/yyyy date: {value!r}")
+    day, month, year = match.groups()
+    return date(int(year), int(month), int(day))
+
+
+def _parse_iso(value: str) -> date:
+    if len(value) == 10 and value[4] == '-' and value[7] == '-':
+        return date.fromisoformat(value)
+    # Unpadded dates such as 2005-1-9; fromisoformat would also take forms strptime rejects
+    return datetime.strptime(value, '%Y-%m-%d').date()
+
+
+# Accepted date of birth formats, in the order they are tried: 31/12/2005, 2005-12-31
+DOB_PARSERS = (_parse_dmy, _parse_iso)
+
+
+class DateParser:
+    """parse_dob for a batch: remembers which format matched and tries it first.
+
+    Rows of one file or request almost always share a format, so after the first
+    row each value costs one parse instead of a failed attempt plus a retry.
+    """
+
+    def __init__(self):
+        self._parsers = DOB_PARSERS
+
+    def __call__(self, value):
+        if not value:
+            return None
+        for parser in self._parsers:
             try:
-                dob = datetime.strptime(domain.dob, '%Y-%m-%d').date()
+                parsed = parser(value)
             except (ValueError, TypeError):
-                dob = None
-    
+                continue
+            if parser is not self._parsers[0]:
+                self._parsers = (parser, *(other for other in DOB_PARSERS if other is not parser))
+            return parsed
+        return None
+
+
+def parse_dob(value):
+    """Date of birth from dd/mm/yyyy or yyyy-mm-dd, None if empty or unparseable.
+
+    For many values use one DateParser per batch instead.
+    """
+    return DateParser()(value)
+
+
+def to_entity(domain: Student, parse_date=parse_dob) -> StudentModel:
     return StudentModel(
         student_id=domain.student_id,
         first_name=domain.first_name,
         last_name=domain.last_name,
         email=domain.email,
-        dob=dob,
+        dob=parse_date(domain.dob),
         hometown=domain.hometown,
         math_score=domain.math_score,
         english_score=domain.english_score,
         literature_score = domain.literature_score
     )
 
+
 def to_domain(entity: StudentModel) -> Student:
+    """Validated domain model from an entity, or from any row with the same column attributes."""
     return Student(
         student_id=entity.student_id,
         first_name=entity.first_name,
@@ -35,5 +88,14 @@ def to_domain(entity: StudentModel) -> Student:
         hometown=entity.hometown,
         math_score=entity.math_score,
         english_score=entity.english_score,
-        literature_score = entity.literature_score
+        literature_score = entity.literature_score,
+        version=entity.version,
+        updated_at=entity.updated_at
     )
+
+
+def apply_update(entity: StudentModel, domain: Student, parse_date=parse_dob) -> None:
+    """Copy every column of domain onto an existing entity in place."""
+    for field in COPIED_FIELDS:
+        setattr(entity, field, getattr(domain, field))
+    entity.dob = parse_date(domain.dob)
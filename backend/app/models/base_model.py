@@ -10,6 +10,7 @@ class BaseResponse(BaseModel, Generic[T]):
     error: Optional[List[str]] = None
     success: bool = True
     data: Optional[List[T]] = None
+    next_cursor: Optional[str] = None
     
     model_config = ConfigDict(arbitrary_types_allowed=True, from_attributes=True)
 
@@ -20,5 +21,6 @@ class BaseResponse(BaseModel, Generic[T]):
             "page_total": self.total_records,
             "data": self.data,
             "error": self.error,
-            "success": self.success
+            "success": self.success,
+            "next_cursor": self.next_cursor
         }
\ No newline at end of file
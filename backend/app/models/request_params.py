@@ -1,5 +1,6 @@
+from datetime import datetime
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 
 class sort_params(BaseModel):
     field: str
@@ -8,10 +9,16 @@ class sort_params(BaseModel):
 class filter_params(BaseModel):
     field: str
     value: str
+    op: str = 'eq'
 
 class request_params(BaseModel):
     page: int
     page_size: int
     sort_by: Optional[sort_params] = None
     filter_by: Optional[filter_params] = None
+    filters: List[filter_params] = []
+    cursor: Optional[str] = None
+    count: str = 'exact'
+    fields: Optional[List[str]] = None
+    since: Optional[datetime] = None
     
\ No newline at end of file
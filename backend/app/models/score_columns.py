@@ -0,0 +1,63 @@
+from typing import Dict, Iterable, List, Optional, Sequence
+import numpy as np
+
+# Column order of ScoreColumns.scores
+SUBJECTS = ('math', 'english', 'literature')
+
+
+class ScoreColumns:
+    """Score columns of the students table held as contiguous NumPy arrays.
+
+    scores is an (n, 3) float64 array in SUBJECTS order with NaN for missing
+    scores; hometown_codes holds each student's index into hometowns, or -1.
+    """
+
+    def __init__(self, scores: np.ndarray, hometown_codes: np.ndarray, hometowns: List[str]):
+        self.scores = scores
+        self.hometown_codes = hometown_codes
+        self.hometowns = hometowns
+
+    def __len__(self):
+        return len(self.scores)
+
+    def save(self, path: str) -> None:
+        """Write a columnar .npz snapshot that load() reads back without touching the database."""
+        np.savez(path, scores=self.scores, hometown_codes=self.hometown_codes,
+                 hometowns=np.array(self.hometowns, dtype=np.str_))
+
+    @classmethod
+    def load(cls, path: str) -> "ScoreColumns":
+        with np.load(path) as snapshot:
+            return cls(snapshot['scores'], snapshot['hometown_codes'], snapshot['hometowns'].tolist())
+
+
+class ScoreColumnsBuilder:
+    """Accumulates (hometown, math, english, literature) row batches into ScoreColumns."""
+
+    def __init__(self):
+        self._scores: List[np.ndarray] = []
+        self._codes: List[np.ndarray] = []
+        self._index: Dict[str, int] = {}
+
+    def _code(self, hometown: Optional[str]) -> int:
+        if not hometown:
+            return -1
+        code = self._index.get(hometown)
+        if code is None:
+            code = self._index[hometown] = len(self._index)
+        return code
+
+    def extend(self, rows: Iterable[Sequence]) -> None:
+        rows = list(rows)
+        if not rows:
+            return
+        # None becomes NaN under a float dtype
+        self._scores.append(np.array([row[1:4] for row in rows], dtype=np.float64))
+        self._codes.append(np.fromiter((self._code(row[0]) for row in rows), dtype=np.int32, count=len(rows)))
+
+    def build(self) -> ScoreColumns:
+        if not self._scores:
+            return ScoreColumns(np.empty((0, len(SUBJECTS))), np.empty(0, dtype=np.int32), [])
+        scores = np.ascontiguousarray(np.concatenate(self._scores))
+        codes = np.concatenate(self._codes)
+        return ScoreColumns(scores, codes, list(self._index))
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, String, Float, BigInteger
+from app.core.database import Base
+
+# scope value of the rows that aggregate every student regardless of hometown. Students
+# with an empty hometown only count towards these, so no hometown scope can take it.
+GLOBAL_SCOPE = ""
+
+class ScoreStatsModel(Base):
+    __tablename__ = "student_score_stats"
+
+    scope = Column(String(100), primary_key=True)
+    subject = Column(String(20), primary_key=True)
+
+    student_count = Column(BigInteger, nullable=False, default=0)
+    excellent_count = Column(BigInteger, nullable=False, default=0)
+    average_count = Column(BigInteger, nullable=False, default=0)
+    poor_count = Column(BigInteger, nullable=False, default=0)
+    score_count = Column(BigInteger, nullable=False, default=0)
+    score_sum = Column(Float, nullable=False, default=0)
+    min_score = Column(Float)
+    max_score = Column(Float)
@@ -1,10 +1,37 @@
-from sqlalchemy import Column, String, Float, Date
+from sqlalchemy import BigInteger, CheckConstraint, Column, String, Float, Date, DateTime, FetchedValue, Index, Integer, text
 from app.core.database import Base
 
+# Secondary indexes on students. student_id is appended so filtered/sorted
+# listings can also walk the index in keyset order.
+STUDENT_INDEXES = {
+    "ix_students_first_name_student_id": ("first_name", "student_id"),
+    "ix_students_last_name_student_id": ("last_name", "student_id"),
+    "ix_students_hometown_student_id": ("hometown", "student_id"),
+    "ix_students_math_score_student_id": ("math_score", "student_id"),
+    "ix_students_english_score_student_id": ("english_score", "student_id"),
+    "ix_students_literature_score_student_id": ("literature_score", "student_id"),
+    "ix_students_updated_at_student_id": ("updated_at", "student_id"),
+}
+# Columns backed by a unique index (the primary key and the email constraint)
+UNIQUE_FIELDS = ("student_id", "email")
+# Indexes for prefix filters (LIKE 'value%'). The ones above follow the database
+# collation, which LIKE can only use under C; varchar_pattern_ops compares bytewise.
+STUDENT_PATTERN_INDEXES = {
+    "ix_students_student_id_pattern": "student_id",
+    "ix_students_first_name_pattern": "first_name",
+    "ix_students_last_name_pattern": "last_name",
+}
+
+
 class StudentModel(Base):
     __tablename__ = "students"
+    __table_args__ = (
+        *(Index(name, *columns) for name, columns in STUDENT_INDEXES.items()),
+        *(Index(name, column, postgresql_ops={column: "varchar_pattern_ops"})
+          for name, column in STUDENT_PATTERN_INDEXES.items()),
+    )
 
-    student_id = Column(String, primary_key=True, index=True)
+    student_id = Column(String, primary_key=True)
     first_name = Column(String(50))
     last_name = Column(String(50))
     email = Column(String(100), unique=True)
@@ -14,3 +41,25 @@ class StudentModel(Base):
     math_score = Column(Float)
     english_score = Column(Float)
     literature_score = Column(Float)
+
+    # Row version, bumped by every UPDATE; also used by the ORM for optimistic locking
+    version = Column(Integer, nullable=False, server_default=text("1"))
+    # Last change, stamped by the students_set_updated_at trigger on every UPDATE
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=text("now()"),
+                        server_onupdate=FetchedValue())
+
+    # eager_defaults reads updated_at back with RETURNING, so it is never left expired after a flush
+    __mapper_args__ = {"version_id_col": version, "eager_defaults": True}
+
+
+class StudentsVersionModel(Base):
+    """Table-level change counter behind the listing ETags: a single row with id 1.
+
+    Every write transaction on students bumps it before committing, so it
+    replicates together with the rows it describes.
+    """
+    __tablename__ = "students_version"
+    __table_args__ = (CheckConstraint("id = 1", name="ck_students_version_single_row"),)
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    version = Column(BigInteger, nullable=False, server_default=text("0"))
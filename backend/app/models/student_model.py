@@ -1,4 +1,5 @@
 # backend/app/models/student.py
+from datetime import datetime
 from typing import Optional, Dict
 from pydantic import BaseModel
 
@@ -13,6 +14,8 @@ class StudentModel(BaseModel):
     math_score: Optional[float] = None
     english_score: Optional[float] = None
     literature_score: Optional[float] = None
+    version: Optional[int] = None
+    updated_at: Optional[datetime] = None
     
     def from_dict(data: Dict):
         return StudentModel(
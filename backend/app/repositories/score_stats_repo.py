@@ -0,0 +1,189 @@
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+from sqlalchemy import select, update, delete, func, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.score_stats import ScoreStatsModel as ScoreStatsEntity, GLOBAL_SCOPE
+from app.models.student import StudentModel as StudentEntity
+
+# Score bands used by the analysis endpoints: excellent >= 8, average 5..8, poor < 5
+EXCELLENT_SCORE = 8
+AVERAGE_SCORE = 5
+SCORE_COLUMNS = {
+    'math': StudentEntity.math_score,
+    'english': StudentEntity.english_score,
+    'literature': StudentEntity.literature_score,
+}
+# Student columns the summary depends on; writes only need to pass these
+STATS_FIELDS = ('hometown', 'math_score', 'english_score', 'literature_score')
+
+COUNTER_FIELDS = ('student_count', 'excellent_count', 'average_count', 'poor_count', 'score_count', 'score_sum')
+
+# Same numbers as ScoreStatsDelta produces, computed from scratch for every scope/subject
+RECOMPUTE_SQL = text(f"""
+    SELECT CASE WHEN GROUPING(s.hometown) = 1 THEN '{GLOBAL_SCOPE}' ELSE s.hometown END AS scope,
+           v.subject,
+           count(*) AS student_count,
+           count(*) FILTER (WHERE v.score >= {EXCELLENT_SCORE}) AS excellent_count,
+           count(*) FILTER (WHERE v.score >= {AVERAGE_SCORE} AND v.score < {EXCELLENT_SCORE}) AS average_count,
+           count(*) FILTER (WHERE v.score < {AVERAGE_SCORE}) AS poor_count,
+           count(v.score) AS score_count,
+           COALESCE(sum(v.score), 0) AS score_sum,
+           min(v.score) AS min_score,
+           max(v.score) AS max_score
+    FROM students s
+    CROSS JOIN LATERAL (VALUES ('math', s.math_score),
+                               ('english', s.english_score),
+                               ('literature', s.literature_score)) AS v(subject, score)
+    GROUP BY GROUPING SETS ((v.subject), (s.hometown, v.subject))
+    HAVING GROUPING(s.hometown) = 1 OR s.hometown <> ''
+""")
+
+
+def stats_fields(obj) -> dict:
+    """The STATS_FIELDS of an ORM entity or mapping."""
+    if isinstance(obj, Mapping):
+        return {field: obj.get(field) for field in STATS_FIELDS}
+    return {field: getattr(obj, field) for field in STATS_FIELDS}
+
+
+class ScoreStatsDelta:
+    """Net change to student_score_stats caused by one transaction's writes.
+
+    add()/remove() take the STATS_FIELDS of a student row as it is after/was
+    before the write; apply() folds everything into one upsert.
+    """
+
+    def __init__(self):
+        self._groups: Dict[Tuple[str, str], dict] = {}
+        # groups that lost a score, whose min/max may have to be recomputed
+        self._shrunk = set()
+
+    def __bool__(self):
+        return bool(self._groups)
+
+    def add(self, row: Mapping):
+        self._track(row, 1)
+
+    def remove(self, row: Mapping):
+        self._track(row, -1)
+
+    def _track(self, row: Mapping, sign: int):
+        hometown = row.get('hometown')
+        scopes = (GLOBAL_SCOPE, hometown) if hometown else (GLOBAL_SCOPE,)
+        for scope in scopes:
+            for subject in SCORE_COLUMNS:
+                score = row.get(f'{subject}_score')
+                group = self._groups.get((scope, subject))
+                if group is None:
+                    group = self._groups[(scope, subject)] = dict.fromkeys(COUNTER_FIELDS, 0)
+                    group.update(min_score=None, max_score=None)
+                group['student_count'] += sign
+                if score is None:
+                    continue
+                if score >= EXCELLENT_SCORE:
+                    group['excellent_count'] += sign
+                elif score >= AVERAGE_SCORE:
+                    group['average_count'] += sign
+                else:
+                    group['poor_count'] += sign
+                group['score_count'] += sign
+                group['score_sum'] += sign * score
+                if sign > 0:
+                    group['min_score'] = score if group['min_score'] is None else min(group['min_score'], score)
+                    group['max_score'] = score if group['max_score'] is None else max(group['max_score'], score)
+                else:
+                    self._shrunk.add((scope, subject))
+
+    async def apply(self, session: AsyncSession):
+        """Write the delta in the caller's transaction, after the student rows are flushed."""
+        if not self._groups:
+            return
+        table = ScoreStatsEntity.__table__
+        stmt = pg_insert(ScoreStatsEntity).values([
+            {'scope': scope, 'subject': subject, **group} for (scope, subject), group in self._groups.items()
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ScoreStatsEntity.scope, ScoreStatsEntity.subject],
+            set_={
+                **{field: table.c[field] + stmt.excluded[field] for field in COUNTER_FIELDS},
+                'min_score': func.least(table.c.min_score, stmt.excluded.min_score),
+                'max_score': func.greatest(table.c.max_score, stmt.excluded.max_score),
+            },
+        )
+        await session.execute(stmt)
+        # A removed score may have been the extreme, so those bounds come from the table again
+        for scope, subject in self._shrunk:
+            score = SCORE_COLUMNS[subject]
+            students = [] if scope == GLOBAL_SCOPE else [StudentEntity.hometown == scope]
+            await session.execute(
+                update(ScoreStatsEntity)
+                .where(ScoreStatsEntity.scope == scope, ScoreStatsEntity.subject == subject)
+                .values(
+                    min_score=select(func.min(score)).where(*students).scalar_subquery(),
+                    max_score=select(func.max(score)).where(*students).scalar_subquery(),
+                )
+            )
+        self._groups.clear()
+        self._shrunk.clear()
+
+
+async def read_score_stats(session: AsyncSession, hometown: Optional[str] = None) -> Optional[dict]:
+    """Summary in the shape of StudentRepository.get_score_summary, or None if the scope is empty."""
+    result = await session.execute(
+        select(ScoreStatsEntity).where(ScoreStatsEntity.scope == (hometown or GLOBAL_SCOPE))
+    )
+    rows = {row.subject: row for row in result.scalars()}
+    if not rows or not any(row.student_count for row in rows.values()):
+        return None
+    summary = {'total_students': max(row.student_count for row in rows.values())}
+    for subject in SCORE_COLUMNS:
+        row = rows.get(subject)
+        summary[f'{subject}_excellent'] = row.excellent_count if row else 0
+        summary[f'{subject}_average'] = row.average_count if row else 0
+        summary[f'{subject}_poor'] = row.poor_count if row else 0
+        summary[f'{subject}_min'] = row.min_score if row else None
+        summary[f'{subject}_max'] = row.max_score if row else None
+        summary[f'{subject}_avg'] = row.score_sum / row.score_count if row and row.score_count else None
+    return summary
+
+
+def _drifted(stored: Optional[dict], fresh: Optional[dict]) -> bool:
+    empty = dict.fromkeys(COUNTER_FIELDS, 0)
+    stored, fresh = stored or empty, fresh or empty
+    for field in COUNTER_FIELDS:
+        tolerance = 1e-6 * max(1.0, abs(fresh.get(field) or 0)) if field == 'score_sum' else 0
+        if abs((stored.get(field) or 0) - (fresh.get(field) or 0)) > tolerance:
+            return True
+    return stored.get('min_score') != fresh.get('min_score') or stored.get('max_score') != fresh.get('max_score')
+
+
+async def rebuild_score_stats(session: AsyncSession) -> List[dict]:
+    """Recompute student_score_stats from the students table and return the groups that had drifted.
+
+    Locks the summary table for the rest of the caller's transaction so concurrent
+    writes queue behind the rebuild instead of applying deltas to rows being replaced.
+    """
+    await session.execute(text(f'LOCK TABLE {ScoreStatsEntity.__tablename__} IN EXCLUSIVE MODE'))
+    fresh = {(row.scope, row.subject): dict(row._mapping) for row in await session.execute(RECOMPUTE_SQL)}
+    stored = {
+        (row.scope, row.subject): {field: getattr(row, field) for field in (*COUNTER_FIELDS, 'min_score', 'max_score')}
+        for row in (await session.execute(select(ScoreStatsEntity))).scalars()
+    }
+    drift = []
+    for scope, subject in sorted(stored.keys() | fresh.keys()):
+        before, after = stored.get((scope, subject)), fresh.get((scope, subject))
+        if _drifted(before, after):
+            drift.append({'scope': scope, 'subject': subject, 'stored': before, 'recomputed': after})
+    await session.execute(delete(ScoreStatsEntity))
+    if fresh:
+        await session.execute(pg_insert(ScoreStatsEntity).values(list(fresh.values())))
+    return drift
+
+
+def delta_for(added: Iterable = (), removed: Iterable = ()) -> ScoreStatsDelta:
+    delta = ScoreStatsDelta()
+    for row in removed:
+        delta.remove(stats_fields(row))
+    for row in added:
+        delta.add(stats_fields(row))
+    return delta
@@ -1,20 +1,283 @@
 import csv
+import time
+import tracemalloc
+from datetime import datetime
+from itertools import islice
 from pathlib import Path
-from typing import List, Callable
+from typing import AsyncContextManager, AsyncIterator, Iterable, Iterator, List, Callable, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-from app.models.student import StudentModel as StudentEntity
+from sqlalchemy import select, update, delete, func, insert, text, values, column, exists, literal, literal_column, and_, any_, bindparam, String
+from sqlalchemy.dialects.postgresql import insert as pg_insert, ARRAY
+from app.models.student import StudentModel as StudentEntity, StudentsVersionModel
 from app.models.student_model import StudentModel
 from app.models.base_model import BaseResponse
-from app.mapper.student_mapping import to_entity, to_domain
-from app.models.request_params import request_params
+from app.mapper.student_mapping import to_entity, to_domain, apply_update, parse_dob, DateParser
+from app.models.request_params import request_params, filter_params
+from app.utils.pagination import encode_cursor, decode_cursor, keyset_segments
+from app.utils.cache import TTLCache, CacheBackend, LRUCache
+from app.core.config import Settings, get_settings
+from app.utils.filtering import compile_filters, unindexed_reason, DEFAULT_SORT_FIELD
+from app.models.score_columns import ScoreColumns, ScoreColumnsBuilder
+from app.repositories.score_stats_repo import (
+    EXCELLENT_SCORE, AVERAGE_SCORE, SCORE_COLUMNS, STATS_FIELDS,
+    ScoreStatsDelta, delta_for, stats_fields, read_score_stats, rebuild_score_stats,
+)
 
 DATA_FILE = Path('app/seeds/students.csv')
 
+# Column order of the seed/roster CSV files and of the matching table columns
+CSV_COLUMNS = ['student_id', 'first_name', 'last_name', 'email', 'date_of_birth', 'hometown', 'math_score', 'english_score', 'literature_score']
+IMPORT_COLUMNS = ['student_id', 'first_name', 'last_name', 'email', 'dob', 'hometown', 'math_score', 'english_score', 'literature_score']
+# Every column of a student record as the API returns it
+RECORD_COLUMNS = [*IMPORT_COLUMNS, 'version', 'updated_at']
+# Columns a PATCH may change
+PATCHABLE_FIELDS = [name for name in IMPORT_COLUMNS if name != 'student_id']
+# PostgreSQL accepts at most 32767 bind parameters per statement
+MAX_BIND_PARAMETERS = 32767
+MAX_UPSERT_BATCH_SIZE = MAX_BIND_PARAMETERS // len(IMPORT_COLUMNS)
+
+_settings = get_settings()
+
+# total_records per filter signature, shared by all repository instances and
+# cleared by every write that goes through the repository in this process; with
+# several workers it is skipped (Settings.single_process)
+_count_cache = TTLCache(ttl=_settings.count_cache_ttl)
+# Last ScoreColumns loaded for the analytics endpoints, dropped on the same writes
+_score_columns_cache = TTLCache(ttl=_settings.score_columns_cache_ttl, max_size=1)
+# Read-through cache of StudentModel by student_id in front of get_student_by_id
+student_cache: CacheBackend = LRUCache(max_size=_settings.student_cache_size, ttl=_settings.student_cache_ttl)
+
+
+def configure_student_cache(backend: CacheBackend) -> None:
+    """Swap the student cache backend, e.g. for an ExternalCache at startup."""
+    global student_cache
+    student_cache = backend
+
+
+def _student_key(student_id: str) -> str:
+    return f"student:{student_id}"
+
+
+def _to_score(value):
+    value = (value or '').strip()
+    return float(value) if value else None
+
+
+def _read_csv_chunks(file_path: str, chunk_size: int) -> Iterator[List[Tuple]]:
+    """Yield the CSV as lists of at most chunk_size record tuples in IMPORT_COLUMNS order."""
+    with Path(file_path).open(mode='r', encoding='utf-8', newline='') as file:
+        reader = csv.DictReader(file)
+        parse_date = DateParser()
+        while True:
+            chunk = [
+                (
+                    row['student_id'],
+                    row['first_name'] or None,
+                    row['last_name'] or None,
+                    row['email'] or None,
+                    parse_date(row['date_of_birth']),
+                    row['hometown'] or None,
+                    _to_score(row['math_score']),
+                    _to_score(row['english_score']),
+                    _to_score(row['literature_score']),
+                )
+                for row in islice(reader, chunk_size)
+            ]
+            if not chunk:
+                return
+            yield chunk
+
+
+def _projection(fields: List[str]) -> list:
+    """Columns for a sparse fieldset; raises ValueError for names that are not student columns."""
+    unknown = [field for field in fields if field not in RECORD_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown fields {', '.join(unknown)}; available: {', '.join(RECORD_COLUMNS)}.")
+    return [getattr(StudentEntity, field) for field in dict.fromkeys(fields)]
+
+
+def _to_row(student: StudentModel, parse_date=parse_dob) -> dict:
+    return {
+        'student_id': student.student_id,
+        'first_name': student.first_name,
+        'last_name': student.last_name,
+        'email': student.email,
+        'dob': parse_date(student.dob),
+        'hometown': student.hometown,
+        'math_score': student.math_score,
+        'english_score': student.english_score,
+        'literature_score': student.literature_score,
+    }
+
+
+def _typed_values(columns: List[str], rows: Iterable[Tuple]):
+    """VALUES list named batch with a typed bind in every cell.
+
+    A bare NULL would leave PostgreSQL to type a column that is NULL in every
+    row as text, which then fails to assign to a float or date column.
+    """
+    types = [StudentEntity.__table__.c[name].type for name in columns]
+    return values(*[column(name, type_) for name, type_ in zip(columns, types)], name='batch').data(
+        [tuple(literal(value, type_) for value, type_ in zip(row, types)) for row in rows]
+    )
+
+
+def _upsert_statement(rows: List[dict]):
+    """INSERT ... SELECT FROM (VALUES ...) ON CONFLICT (student_id) DO UPDATE.
+
+    Rows whose email already belongs to another student are filtered out in the
+    SELECT, so they are simply absent from RETURNING instead of aborting the batch.
+    xmax = 0 on the returned row means it was freshly inserted rather than updated.
+    """
+    batch = _typed_values(IMPORT_COLUMNS, [tuple(row[name] for name in IMPORT_COLUMNS) for row in rows])
+    email_taken = exists().where(
+        StudentEntity.email == batch.c.email,
+        StudentEntity.student_id != batch.c.student_id,
+    )
+    stmt = pg_insert(StudentEntity).from_select(IMPORT_COLUMNS, select(batch).where(~email_taken))
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[StudentEntity.student_id],
+        set_={
+            **{name: stmt.excluded[name] for name in IMPORT_COLUMNS if name != 'student_id'},
+            'version': StudentEntity.__table__.c.version + 1,
+        },
+    )
+    return stmt.returning(
+        StudentEntity.student_id,
+        literal_column('xmax = 0').label('inserted'),
+        *[getattr(StudentEntity, field) for field in STATS_FIELDS],
+    )
+
+
+def _patch_values(changes: dict, parse_date=parse_dob) -> dict:
+    """Validate the changed fields of one PATCH and convert them to column values."""
+    unknown = [field for field in changes if field not in PATCHABLE_FIELDS]
+    if unknown:
+        raise ValueError(f"Fields {', '.join(unknown)} cannot be updated; allowed: {', '.join(PATCHABLE_FIELDS)}.")
+    if not changes:
+        raise ValueError('No fields to update.')
+    row = dict(changes)
+    # Only an explicit null clears dob; anything else has to parse
+    if row.get('dob') is not None:
+        row['dob'] = parse_date(row['dob'])
+        if row['dob'] is None:
+            raise ValueError(f"Invalid dob {changes['dob']!r}; expected dd/mm/yyyy or yyyy-mm-dd.")
+    return row
+
+
+def _patch_statement(columns: List[str], rows: List[Tuple]):
+    """One UPDATE ... FROM (VALUES ...) RETURNING for (student_id, *columns) rows.
+
+    The old CTE locks the target rows and hands their previous STATS_FIELDS to
+    RETURNING as old_<field>, since RETURNING itself only sees the new values.
+    Rows whose student_id does not exist are simply absent from the result.
+    """
+    table = StudentEntity.__table__
+    batch = _typed_values(['student_id', *columns], rows)
+    old = (
+        select(table.c.student_id, *[table.c[field] for field in STATS_FIELDS])
+        .where(table.c.student_id.in_([row[0] for row in rows]))
+        .with_for_update()
+        .cte('old')
+    )
+    return (
+        update(table)
+        .where(table.c.student_id == batch.c.student_id, table.c.student_id == old.c.student_id)
+        .values(**{name: batch.c[name] for name in columns}, version=table.c.version + 1)
+        .returning(*[table.c[name] for name in RECORD_COLUMNS],
+                   *[old.c[field].label(f'old_{field}') for field in STATS_FIELDS])
+    )
+
+
+def _any_id(student_ids: List[str]):
+    """student_id = ANY(:ids): one array parameter however many ids there are."""
+    return StudentEntity.__table__.c.student_id == any_(bindparam('ids', list(student_ids), type_=ARRAY(String)))
+
+
 class StudentRepository():
     
-    def __init__(self, session_factory: Callable[[], AsyncSession]):
+    def __init__(self, session_factory: Callable[[], AsyncContextManager[AsyncSession]],
+                 settings: Optional[Settings] = None,
+                 read_session_factory: Optional[Callable[[], AsyncContextManager[AsyncSession]]] = None):
         self.session_factory = session_factory
+        # Read-only methods use the replica until this instance writes, then stay on
+        # the primary so the caller reads its own writes despite replication lag
+        self.read_session_factory = read_session_factory or session_factory
+        self._wrote = False
+        self.settings = settings or get_settings()
+    
+    def _uses_student_cache(self) -> bool:
+        """Student cache on and coherent: one worker process, or a backend every worker shares."""
+        return self.settings.enable_student_cache and (self.settings.single_process or student_cache.shared)
+    
+    def _read_session(self) -> AsyncContextManager[AsyncSession]:
+        return self.session_factory() if self._wrote else self.read_session_factory()
+    
+    async def _invalidate_caches(self, student_ids: Iterable[str] = ()):
+        """Drop cached results a committed write may have changed; student_ids are the rows it touched."""
+        self._wrote = True
+        _count_cache.clear()
+        _score_columns_cache.clear()
+        keys = [_student_key(student_id) for student_id in student_ids]
+        if keys and self._uses_student_cache():
+            await student_cache.delete(*keys)
+    
+    async def _bump_table_version(self, session: AsyncSession):
+        """Advance the students change counter inside the caller's write transaction, just before commit.
+
+        Committed (and replicated) together with the rows, so a reader never
+        sees a counter that disagrees with the data. Taken last, the row lock
+        is held only for the commit.
+        """
+        table = StudentsVersionModel.__table__
+        stmt = pg_insert(table).values(id=1, version=1)
+        await session.execute(stmt.on_conflict_do_update(index_elements=[table.c.id],
+                                                         set_={'version': table.c.version + 1}))
+    
+    async def get_table_version(self) -> int:
+        """Current value of the students change counter.
+
+        Read where the listing itself is read, so the ETag always describes the rows it covers.
+        """
+        async with self._read_session() as session:
+            version = (await session.execute(select(StudentsVersionModel.version))).scalar()
+        return version or 0
+    
+    async def get_student_revision(self, student_id: str) -> Optional[Tuple[int, datetime]]:
+        """(version, updated_at) of a student, from the cache when possible; None if it does not exist.
+
+        version alone restarts at 1 when a student is deleted and created again;
+        updated_at tells the two rows apart.
+        """
+        use_cache = self._uses_student_cache()
+        if use_cache:
+            student = await student_cache.get(_student_key(student_id))
+            if student is not None:
+                return student.version, student.updated_at
+        # Same source get_student_by_id would read, so the ETag matches the body
+        async with (self.session_factory() if use_cache else self._read_session()) as session:
+            row = (await session.execute(
+                select(StudentEntity.version, StudentEntity.updated_at).where(StudentEntity.student_id == student_id)
+            )).one_or_none()
+        return tuple(row) if row else None
+    
+    async def _count_students(self, session: AsyncSession, conditions: list, signature, mode: str = 'exact') -> int:
+        if mode == 'estimate' and not conditions:
+            # Planner statistics; -1 (never analyzed) falls through to an exact count
+            estimate = (await session.execute(
+                text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'students'::regclass")
+            )).scalar()
+            if estimate is not None and estimate >= 0:
+                return estimate
+        # Other workers' writes never clear this process's cache
+        total = _count_cache.get(signature) if self.settings.single_process else None
+        if total is None:
+            total = (await session.execute(
+                select(func.count()).select_from(StudentEntity).where(*conditions)
+            )).scalar()
+            if self.settings.single_process:
+                _count_cache.set(signature, total)
+        return total
     
     async def load_students(self, file_path: str) -> BaseResponse[StudentModel]:
         students: List[StudentModel] = []
@@ -43,20 +306,164 @@ class StudentRepository():
         data_students = students
         try: 
             async with self.session_factory() as session:
+                parse_date = DateParser()
                 for student in data_students:
-                    session.add(to_entity(student))
+                    session.add(to_entity(student, parse_date))
+                await session.flush()
+                await delta_for(added=data_students).apply(session)
+                await self._bump_table_version(session)
                 await session.commit()
+                await self._invalidate_caches(student.student_id for student in data_students)
         except Exception as e:
             res.success = False
             res.error = [str(e)]
         return res
     
+    async def import_students_csv(self, file_path: str, chunk_size: Optional[int] = None,
+                                  use_copy: Optional[bool] = None, measure_memory: bool = False) -> BaseResponse[dict]:
+        """Stream a roster CSV into the table chunk by chunk in a single transaction.
+
+        On asyncpg each chunk is sent with COPY (copy_records_to_table); other drivers,
+        or use_copy=False, get multi-row INSERT ... VALUES batches. insert_students
+        remains the per-row ORM path. measure_memory traces allocations with
+        tracemalloc to report peak_memory_bytes; it slows the import, so rows/s
+        is only comparable between runs with the same setting.
+        """
+        res = BaseResponse[dict](success=True)
+        chunk_size = chunk_size or self.settings.import_chunk_size
+        use_copy = self.settings.use_copy_import if use_copy is None else use_copy
+        tracing = measure_memory and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        started = time.perf_counter()
+        total = 0
+        method = 'insert'
+        delta = ScoreStatsDelta()
+        try:
+            async with self.session_factory() as session:
+                conn = await session.connection()
+                if use_copy and conn.dialect.driver == 'asyncpg':
+                    method = 'copy'
+                    # Any statement through the adapter opens the transaction before COPY bypasses it
+                    await session.execute(text('SELECT 1'))
+                    raw = await conn.get_raw_connection()
+                for chunk in _read_csv_chunks(file_path, chunk_size):
+                    if method == 'copy':
+                        await raw.driver_connection.copy_records_to_table(
+                            StudentEntity.__tablename__, records=chunk, columns=IMPORT_COLUMNS
+                        )
+                    else:
+                        await session.execute(insert(StudentEntity), [dict(zip(IMPORT_COLUMNS, row)) for row in chunk])
+                    for row in chunk:
+                        delta.add(dict(zip(IMPORT_COLUMNS, row)))
+                    total += len(chunk)
+                await delta.apply(session)
+                await self._bump_table_version(session)
+                await session.commit()
+                await self._invalidate_caches()
+            elapsed = time.perf_counter() - started
+            res.data = [{
+                'method': method,
+                'rows': total,
+                'seconds': round(elapsed, 3),
+                'rows_per_second': round(total / elapsed, 1) if elapsed else None,
+                'peak_memory_bytes': tracemalloc.get_traced_memory()[1] if tracing else None,
+            }]
+            res.total_records = total
+        except Exception as e:
+            res.success = False
+            res.error = [str(e)]
+        finally:
+            if tracing:
+                tracemalloc.stop()
+        return res
+
+    async def upsert_students(self, students: List[StudentModel],
+                              batch_size: Optional[int] = None) -> BaseResponse[dict]:
+        """Insert or update students in set-based batches, one statement and commit per batch.
+
+        data[0] lists the inserted and updated student_ids and the rejected rows with
+        a reason. A batch that fails in the database is rolled back and all of its rows
+        are rejected; earlier batches stay committed.
+        """
+        res = BaseResponse[dict](success=True)
+        inserted, updated, rejected = [], [], []
+        batch_size = max(1, min(batch_size or self.settings.upsert_batch_size, MAX_UPSERT_BATCH_SIZE))
+        seen_ids, seen_emails = set(), set()
+        parse_date = DateParser()
+        rows = []
+        for index, student in enumerate(students):
+            reason = None
+            if not student.student_id or not student.student_id.strip():
+                reason = 'student_id is required'
+            elif student.student_id in seen_ids:
+                reason = 'duplicate student_id in request'
+            elif student.email and student.email in seen_emails:
+                reason = 'duplicate email in request'
+            if reason:
+                rejected.append({'row': index, 'student_id': student.student_id, 'reason': reason})
+                continue
+            seen_ids.add(student.student_id)
+            if student.email:
+                seen_emails.add(student.email)
+            rows.append((index, _to_row(student, parse_date)))
+        try:
+            async with self.session_factory() as session:
+                for start in range(0, len(rows), batch_size):
+                    batch = rows[start:start + batch_size]
+                    try:
+                        # Previous values of rows about to be overwritten, for the score summary
+                        previous = await session.execute(
+                            select(StudentEntity.student_id, *[getattr(StudentEntity, field) for field in STATS_FIELDS])
+                            .where(StudentEntity.student_id.in_([row['student_id'] for _, row in batch]))
+                            .with_for_update()
+                        )
+                        previous = {item.student_id: item._mapping for item in previous}
+                        result = await session.execute(_upsert_statement([row for _, row in batch]))
+                        written = {}
+                        delta = ScoreStatsDelta()
+                        for item in result:
+                            written[item.student_id] = item.inserted
+                            if not item.inserted:
+                                delta.remove(dict(previous[item.student_id]))
+                            delta.add(dict(item._mapping))
+                        await delta.apply(session)
+                        if written:
+                            await self._bump_table_version(session)
+                        await session.commit()
+                        await self._invalidate_caches(written)
+                    except Exception as e:
+                        await session.rollback()
+                        rejected.extend({'row': index, 'student_id': row['student_id'], 'reason': str(e)}
+                                        for index, row in batch)
+                        continue
+                    for index, row in batch:
+                        student_id = row['student_id']
+                        if student_id not in written:
+                            rejected.append({'row': index, 'student_id': student_id,
+                                             'reason': f"email {row['email']} belongs to another student"})
+                        elif written[student_id]:
+                            inserted.append(student_id)
+                        else:
+                            updated.append(student_id)
+        except Exception as e:
+            res.success = False
+            res.error = [str(e)]
+        rejected.sort(key=lambda item: item['row'])
+        res.data = [{'inserted': inserted, 'updated': updated, 'rejected': rejected}]
+        res.total_records = len(inserted) + len(updated)
+        return res
+
     async def create_student(self, student: StudentModel) -> BaseResponse[StudentModel]:
         res = BaseResponse[StudentModel](success=True)
         try: 
             async with self.session_factory() as session:
                 session.add(to_entity(student))
+                await session.flush()
+                await delta_for(added=[_to_row(student)]).apply(session)
+                await self._bump_table_version(session)
                 await session.commit()
+                await self._invalidate_caches([student.student_id])
                 created_student = await session.get(StudentEntity, student.student_id)
                 if created_student:
                     res.data = [to_domain(created_student)]
@@ -70,37 +477,82 @@ class StudentRepository():
     
     async def get_list_students(self, request_params: request_params) -> BaseResponse[StudentModel]:
         res = BaseResponse[StudentModel](success=True) 
+        sort_field, ascending = DEFAULT_SORT_FIELD, True
+        if request_params.sort_by:
+            sort_field = request_params.sort_by.field
+            ascending = request_params.sort_by.ascending
+        filters = list(request_params.filters)
+        if request_params.filter_by:
+            filters.append(request_params.filter_by)
+        if request_params.since:
+            # Rows changed at or after since; served by the (updated_at, student_id) index
+            filters.append(filter_params(field='updated_at', op='gte', value=request_params.since.isoformat()))
         try:
-            async with self.session_factory() as session:
-                query = select(StudentEntity)
-                
-                if request_params.filter_by:
-                    filter_field = request_params.filter_by.field
-                    filter_value = request_params.filter_by.value
-                    if hasattr(StudentEntity, filter_field):
-                        query = query.where(getattr(StudentEntity, filter_field) == filter_value)
+            conditions, signature, equality_fields, range_fields = compile_filters(filters)
+        except ValueError as e:
+            res.success = False
+            res.error = [str(e)]
+            return res
+        reason = unindexed_reason(equality_fields, range_fields, sort_field,
+                                  enforce_indexes=self.settings.enforce_indexed_queries)
+        if reason:
+            res.success = False
+            res.error = [reason]
+            return res
+        fields = request_params.fields
+        try:
+            # Plain column tuples, not entities: rows go to the response as dicts with no ORM or Pydantic hop
+            columns = list(dict.fromkeys(fields)) if fields else RECORD_COLUMNS
+            # The cursor needs the sort key and student_id even when they are not requested
+            keys = [field for field in (sort_field, 'student_id') if field not in columns]
+            query = select(*_projection([*columns, *keys]))
+        except ValueError as e:
+            res.success = False
+            res.error = [str(e)]
+            return res
+        try:
+            async with self._read_session() as session:
+                query = query.where(*conditions)
                 
-                if request_params.sort_by:
-                    sort_field = request_params.sort_by.field
-                    if hasattr(StudentEntity, sort_field):
-                        if request_params.sort_by.ascending:
-                            query = query.order_by(getattr(StudentEntity, sort_field).asc())
-                        else:
-                            query = query.order_by(getattr(StudentEntity, sort_field).desc())
+                sort_column = getattr(StudentEntity, sort_field)
+                order = [sort_column.asc() if ascending else sort_column.desc()]
+                if sort_field != 'student_id':
+                    # student_id breaks ties so pages are stable and the keyset is unique
+                    order.append(StudentEntity.student_id.asc() if ascending else StudentEntity.student_id.desc())
+                query = query.order_by(*order)
                 
-                if request_params.page_size and request_params.page:
+                segments = [None]
+                if request_params.cursor:
+                    try:
+                        last_value, last_id = decode_cursor(request_params.cursor, sort_field, sort_column)
+                    except ValueError as e:
+                        res.success = False
+                        res.error = [str(e)]
+                        return res
+                    segments = keyset_segments(sort_column, StudentEntity.student_id, last_value, last_id, ascending,
+                                               nullable=StudentEntity.__table__.c[sort_field].nullable)
+                elif request_params.page_size and request_params.page:
                     offset = (request_params.page - 1) * request_params.page_size
-                    query = query.offset(offset).limit(request_params.page_size)
+                    query = query.offset(offset)
                 
-                result = await session.execute(query)   
-                students = result.scalars().all()
-                res.data = students
+                # One extra row tells whether another page follows. A later keyset
+                # segment (e.g. the NULL sort keys) is only read once the earlier one runs out.
+                students = []
+                for segment in segments:
+                    segment_query = query if segment is None else query.where(segment)
+                    result = await session.execute(segment_query.limit(request_params.page_size + 1 - len(students)))
+                    students.extend(result.all())
+                    if len(students) > request_params.page_size:
+                        break
+                if len(students) > request_params.page_size:
+                    students = students[:request_params.page_size]
+                    last = students[-1]
+                    res.next_cursor = encode_cursor(sort_field, getattr(last, sort_field), last.student_id)
+                res.data = [dict(zip(columns, row)) for row in students]
                 res.page_number = request_params.page
                 res.page_size = request_params.page_size
                 
-                count_query = select(func.count()).select_from(StudentEntity)
-                total_result = await session.execute(count_query)
-                res.total_records = total_result.scalar()
+                res.total_records = await self._count_students(session, conditions, signature, request_params.count)
         except Exception as e:  
             res.success = False
             res.error = [str(e)]
@@ -109,7 +561,7 @@ class StudentRepository():
     async def get_all_students(self) -> BaseResponse[StudentModel]:
         res = BaseResponse[StudentModel](success=True)
         try:
-            async with self.session_factory() as session:
+            async with self._read_session() as session:
                 result = await session.execute(select(StudentEntity))
                 students = result.scalars().all()
                 res.data = [to_domain(student) for student in students]
@@ -118,29 +570,194 @@ class StudentRepository():
             res.error = [str(e)]
         return res
     
-    async def get_student_by_id(self, student_id: str) -> BaseResponse[StudentModel]:
-        res = BaseResponse[StudentModel](success=True)
+    async def stream_students(self, batch_size: Optional[int] = None) -> AsyncIterator[List[Tuple]]:
+        """Every student as IMPORT_COLUMNS tuples, in student_id order, batch_size rows at a time.
+
+        Rows come from a server-side cursor, so memory is bounded by batch_size; the
+        session stays open until the caller has consumed or closed the iterator.
+        """
+        batch_size = batch_size or self.settings.export_batch_size
+        async with self._read_session() as session:
+            result = await session.stream(
+                select(*_projection(IMPORT_COLUMNS))
+                .order_by(StudentEntity.student_id)
+                .execution_options(yield_per=batch_size)
+            )
+            async for partition in result.partitions(batch_size):
+                yield partition
+
+    async def get_score_summary(self, hometown: Optional[str] = None) -> BaseResponse[dict]:
+        """Band counts, min, max and average of every score column in one aggregate query."""
+        res = BaseResponse[dict](success=True)
+        aggregates = [func.count().label('total_students')]
+        for subject, score in SCORE_COLUMNS.items():
+            aggregates += [
+                func.count().filter(score >= EXCELLENT_SCORE).label(f'{subject}_excellent'),
+                func.count().filter(and_(score >= AVERAGE_SCORE, score < EXCELLENT_SCORE)).label(f'{subject}_average'),
+                func.count().filter(score < AVERAGE_SCORE).label(f'{subject}_poor'),
+                func.min(score).label(f'{subject}_min'),
+                func.max(score).label(f'{subject}_max'),
+                func.avg(score).label(f'{subject}_avg'),
+            ]
+        try:
+            async with self._read_session() as session:
+                query = select(*aggregates)
+                if hometown:
+                    query = query.where(StudentEntity.hometown == hometown)
+                result = await session.execute(query)
+                res.data = [dict(result.one()._mapping)]
+        except Exception as e:
+            res.success = False
+            res.error = [str(e)]
+        return res
+    
+    async def get_score_stats(self, hometown: Optional[str] = None) -> BaseResponse[dict]:
+        """Same summary as get_score_summary, read from the maintained student_score_stats rows."""
+        res = BaseResponse[dict](success=True)
+        try:
+            async with self._read_session() as session:
+                summary = await read_score_stats(session, hometown)
+                res.data = [summary] if summary else [{'total_students': 0}]
+        except Exception as e:
+            res.success = False
+            res.error = [str(e)]
+        return res
+    
+    async def rebuild_score_stats(self) -> BaseResponse[dict]:
+        """Recompute student_score_stats from scratch; data lists the groups that had drifted."""
+        res = BaseResponse[dict](success=True)
         try:
             async with self.session_factory() as session:
-                student = await session.get(StudentEntity, student_id)
-                if student:
-                    res.data = [to_domain(student)]
-                else:
-                    res.success = False
-                    res.error = [f'Student with ID {student_id} not found.']
+                res.data = await rebuild_score_stats(session)
+                await session.commit()
         except Exception as e:
             res.success = False
             res.error = [str(e)]
         return res
     
+    async def load_score_columns(self, batch_size: Optional[int] = None) -> BaseResponse[ScoreColumns]:
+        """Score columns as NumPy arrays, streamed from a server-side cursor in batch_size partitions."""
+        res = BaseResponse[ScoreColumns](success=True)
+        batch_size = batch_size or self.settings.score_columns_batch_size
+        columns = _score_columns_cache.get('students') if self.settings.single_process else None
+        if columns is not None:
+            res.data = [columns]
+            return res
+        try:
+            async with self._read_session() as session:
+                query = select(
+                    StudentEntity.hometown, StudentEntity.math_score,
+                    StudentEntity.english_score, StudentEntity.literature_score,
+                ).execution_options(yield_per=batch_size)
+                builder = ScoreColumnsBuilder()
+                result = await session.stream(query)
+                async for partition in result.partitions(batch_size):
+                    builder.extend(partition)
+                columns = builder.build()
+                if self.settings.single_process:
+                    _score_columns_cache.set('students', columns)
+                res.data = [columns]
+                res.total_records = len(columns)
+        except Exception as e:
+            res.success = False
+            res.error = [str(e)]
+        return res
+    
+    async def _load_student(self, session_factory, student_id: str) -> Optional[StudentModel]:
+        async with session_factory() as session:
+            entity = await session.get(StudentEntity, student_id)
+        return to_domain(entity) if entity else None
+    
+    async def get_student_by_id(self, student_id: str, fields: Optional[List[str]] = None) -> BaseResponse[StudentModel]:
+        res = BaseResponse[StudentModel](success=True)
+        try:
+            if self._uses_student_cache():
+                # The cache is filled from the primary only, so a lagging replica can't
+                # put back a row a write just invalidated; uncached lookups use the replica
+                student = await student_cache.get_or_load(
+                    _student_key(student_id), lambda: self._load_student(self.session_factory, student_id)
+                )
+            else:
+                student = await self._load_student(self._read_session, student_id)
+            if student:
+                # Sparse fieldsets are cut from the cached full record
+                res.data = [{column.key: getattr(student, column.key) for column in _projection(fields)} if fields else student]
+            else:
+                res.success = False
+                res.error = [f'Student with ID {student_id} not found.']
+        except Exception as e:
+            res.success = False
+            res.error = [str(e)]
+        return res
+    
+    async def get_students_by_ids(self, student_ids: List[str], fields: Optional[List[str]] = None) -> BaseResponse[dict]:
+        """Many students in one query; data[0] holds the records in request order and the missing ids."""
+        res = BaseResponse[dict](success=True)
+        student_ids = list(dict.fromkeys(student_ids))
+        try:
+            columns = list(dict.fromkeys(fields)) if fields else RECORD_COLUMNS
+            keys = [] if 'student_id' in columns else ['student_id']
+            query = select(*_projection([*columns, *keys])).where(_any_id(student_ids))
+        except ValueError as e:
+            res.success = False
+            res.error = [str(e)]
+            return res
+        try:
+            async with self._read_session() as session:
+                rows = (await session.execute(query)).all()
+            found = {row.student_id: dict(zip(columns, row)) for row in rows}
+            res.data = [{
+                'students': [found[student_id] for student_id in student_ids if student_id in found],
+                'missing': [student_id for student_id in student_ids if student_id not in found],
+            }]
+            res.total_records = len(found)
+        except Exception as e:
+            res.success = False
+            res.error = [str(e)]
+        return res
+
+    async def delete_students_by_ids(self, student_ids: List[str]) -> BaseResponse[dict]:
+        """One DELETE ... WHERE student_id = ANY(:ids) RETURNING; data[0] lists deleted and missing ids."""
+        res = BaseResponse[dict](success=True)
+        student_ids = list(dict.fromkeys(student_ids))
+        table = StudentEntity.__table__
+        try:
+            async with self.session_factory() as session:
+                result = await session.execute(
+                    delete(table).where(_any_id(student_ids))
+                    .returning(table.c.student_id, *[table.c[field] for field in STATS_FIELDS])
+                )
+                rows = result.all()
+                await delta_for(removed=[row._mapping for row in rows]).apply(session)
+                if rows:
+                    await self._bump_table_version(session)
+                await session.commit()
+            deleted = {row.student_id for row in rows}
+            if deleted:
+                await self._invalidate_caches(deleted)
+            res.data = [{
+                'deleted': [student_id for student_id in student_ids if student_id in deleted],
+                'missing': [student_id for student_id in student_ids if student_id not in deleted],
+            }]
+            res.total_records = len(deleted)
+        except Exception as e:
+            res.success = False
+            res.error = [str(e)]
+        return res
+
     async def delete_student_by_id(self, student_id: str) -> BaseResponse[StudentModel]:
         res = BaseResponse[StudentModel](success=True)
         try:
             async with self.session_factory() as session:
                 student = await session.get(StudentEntity, student_id)
                 if student:
+                    removed = delta_for(removed=[student])
                     await session.delete(student)
+                    await session.flush()
+                    await removed.apply(session)
+                    await self._bump_table_version(session)
                     await session.commit()
+                    await self._invalidate_caches([student_id])
                 else:
                     res.success = False
                     res.error = [f'Student with ID {student_id} not found.']
@@ -149,17 +766,110 @@ class StudentRepository():
             res.error = [str(e)]
         return res
 
+    async def _apply_patches(self, session: AsyncSession, columns: List[str],
+                             rows: List[Tuple]) -> List[StudentModel]:
+        """Run _patch_statement and stage the score summary delta; the caller commits."""
+        result = await session.execute(_patch_statement(columns, rows))
+        delta = ScoreStatsDelta()
+        students = []
+        for row in result:
+            if any(field in columns for field in STATS_FIELDS):
+                delta.remove({field: row._mapping[f'old_{field}'] for field in STATS_FIELDS})
+                delta.add({field: row._mapping[field] for field in STATS_FIELDS})
+            students.append(to_domain(row))
+        await delta.apply(session)
+        return students
+
+    async def patch_student(self, student_id: str, changes: dict) -> BaseResponse[StudentModel]:
+        """Change only the given fields of one student, in a single UPDATE ... RETURNING."""
+        res = BaseResponse[StudentModel](success=True)
+        try:
+            row = _patch_values(changes)
+        except ValueError as e:
+            res.success = False
+            res.error = [str(e)]
+            return res
+        columns = [name for name in PATCHABLE_FIELDS if name in row]
+        try:
+            async with self.session_factory() as session:
+                students = await self._apply_patches(session, columns, [(student_id, *[row[name] for name in columns])])
+                if students:
+                    await self._bump_table_version(session)
+                await session.commit()
+            if students:
+                await self._invalidate_caches([student_id])
+                res.data = students
+            else:
+                res.success = False
+                res.error = [f'Student with ID {student_id} not found.']
+        except Exception as e:
+            res.success = False
+            res.error = [str(e)]
+        return res
+
+    async def patch_students(self, patches: List[Tuple[str, dict]],
+                             batch_size: Optional[int] = None) -> BaseResponse[dict]:
+        """Apply many partial updates in one transaction.
+
+        Patches that change the same set of fields share UPDATE ... FROM (VALUES ...)
+        statements of up to batch_size rows. data[0] lists the updated student_ids,
+        those that were not found and the rejected patches with a reason; a database
+        error rolls everything back.
+        """
+        res = BaseResponse[dict](success=True)
+        batch_size = batch_size or self.settings.upsert_batch_size
+        rejected, groups, seen_ids = [], {}, set()
+        parse_date = DateParser()
+        for index, (student_id, changes) in enumerate(patches):
+            try:
+                if student_id in seen_ids:
+                    raise ValueError('duplicate student_id in request')
+                row = _patch_values(changes, parse_date)
+            except ValueError as e:
+                rejected.append({'row': index, 'student_id': student_id, 'reason': str(e)})
+                continue
+            seen_ids.add(student_id)
+            columns = tuple(name for name in PATCHABLE_FIELDS if name in row)
+            groups.setdefault(columns, []).append((student_id, *[row[name] for name in columns]))
+        updated = []
+        try:
+            async with self.session_factory() as session:
+                for columns, rows in groups.items():
+                    # VALUES takes 1 + len(columns) parameters per row, the old CTE one more
+                    size = max(1, min(batch_size, MAX_BIND_PARAMETERS // (len(columns) + 2)))
+                    for start in range(0, len(rows), size):
+                        students = await self._apply_patches(session, list(columns), rows[start:start + size])
+                        updated.extend(student.student_id for student in students)
+                if updated:
+                    await self._bump_table_version(session)
+                await session.commit()
+            await self._invalidate_caches(updated)
+        except Exception as e:
+            res.success = False
+            res.error = [str(e)]
+            updated = []
+        found = set(updated)
+        not_found = [student_id for rows in groups.values() for student_id, *_ in rows if student_id not in found] \
+            if res.success else []
+        res.data = [{'updated': updated, 'not_found': not_found, 'rejected': rejected}]
+        res.total_records = len(updated)
+        return res
+
     async def update_student(self, student: StudentModel) -> BaseResponse[StudentModel]:
         res = BaseResponse[StudentModel](success=True)
         try:
             async with self.session_factory() as session:
                 existing_student = await session.get(StudentEntity, student.student_id)
                 if existing_student:
-                    entity = to_entity(student)
-                    for field, value in entity.__dict__.items():
-                        if not field.startswith('_'):
-                            setattr(existing_student, field, value)
+                    delta = ScoreStatsDelta()
+                    delta.remove(stats_fields(existing_student))
+                    apply_update(existing_student, student)
+                    delta.add(stats_fields(existing_student))
+                    await session.flush()
+                    await delta.apply(session)
+                    await self._bump_table_version(session)
                     await session.commit()
+                    await self._invalidate_caches([student.student_id])
                     res.data = [to_domain(existing_student)]
                 else:
                     res.success = False
@@ -0,0 +1,16 @@
+from fastapi import APIRouter
+from app.repositories import student_repo
+from app.core.database import engine, pool_metrics, replica_engine, replica_pool_metrics
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+@router.get("/cache")
+async def cache_metrics():
+    return {"student": student_repo.student_cache.stats()}
+
+@router.get("/pool")
+async def pool_metrics_snapshot():
+    return {
+        "primary": pool_metrics.snapshot(engine),
+        "replica": replica_pool_metrics.snapshot(replica_engine) if replica_engine is not None else None,
+    }
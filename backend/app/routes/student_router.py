@@ -1,48 +1,203 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Header, Request, Response
+from fastapi.responses import StreamingResponse
 from app.services.student_service import StudentService
-from app.schema.student_schema import CreateStudent, StudentResponse
+from app.repositories.student_repo import MAX_UPSERT_BATCH_SIZE, CSV_COLUMNS
+from app.schema.student_schema import CreateStudent, PatchStudent, StudentIds, StudentListResponse, AnalysisResponse
 from app.models.request_params import request_params, sort_params, filter_params
 from app.dependencies import get_student_service
-from typing import Optional
+from app.models.base_model import BaseResponse
+from app.utils.filtering import parse_filter
+from app.utils.etag import etag_matches
+from app.utils.responses import render_response
+from app.utils.export import EXPORT_FORMATS, csv_chunks, ndjson_chunks, parquet_chunks, parquet_available
+from app.core.config import get_settings
+from datetime import datetime
+from typing import List, Optional
 
 router = APIRouter(prefix="/students", tags=["students"])
 
-@router.post("/insert", response_model=dict)
-async def create_student(students: list[CreateStudent], service: StudentService = Depends(get_student_service)):
-    return await service.insert_students(students)
+def _split_fields(fields: Optional[str]) -> Optional[List[str]]:
+    if not fields:
+        return None
+    return [field.strip() for field in fields.split(",") if field.strip()] or None
 
-@router.get("/list")
+def _too_many_ids(student_ids: List[str]) -> Optional[BaseResponse]:
+    limit = get_settings().batch_max_ids
+    if not student_ids:
+        return BaseResponse(success=False, error=["student_ids must not be empty."])
+    if len(student_ids) > limit:
+        return BaseResponse(success=False, error=[f"At most {limit} student_ids per request."])
+    return None
+
+def _revision(record) -> Optional[tuple]:
+    # (version, updated_at) of a returned record; None when a sparse fieldset left them out
+    if not isinstance(record, dict):
+        record = {"version": record.version, "updated_at": record.updated_at}
+    revision = (record.get("version"), record.get("updated_at"))
+    return None if None in revision else revision
+
+def _changes(patch: PatchStudent) -> dict:
+    # Fields left out of the body stay as they are; an explicit null clears the field
+    return patch.model_dump(exclude_unset=True, exclude={"student_id"})
+
+@router.post("/insert", response_model=BaseResponse[dict])
+async def create_student(
+    students: list[CreateStudent],
+    batch_size: Optional[int] = Query(None, ge=1, le=MAX_UPSERT_BATCH_SIZE,
+                                      description="rows per statement; defaults to UPSERT_BATCH_SIZE"),
+    service: StudentService = Depends(get_student_service)
+):
+    return await service.upsert_students(students, batch_size=batch_size)
+
+@router.post("/batch/get", response_model=BaseResponse[dict])
+async def get_students(
+    body: StudentIds,
+    fields: Optional[str] = Query(None, description="comma-separated columns to return"),
+    service: StudentService = Depends(get_student_service)
+):
+    error = _too_many_ids(body.student_ids)
+    if error:
+        return error
+    return render_response(await service.get_students(body.student_ids, fields=_split_fields(fields)))
+
+@router.post("/batch/delete", response_model=BaseResponse[dict])
+async def delete_students(body: StudentIds, service: StudentService = Depends(get_student_service)):
+    error = _too_many_ids(body.student_ids)
+    if error:
+        return error
+    return await service.delete_students(body.student_ids)
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_students(
+    format: str = Query("csv", pattern="^(csv|ndjson|parquet)$"),
+    batch_size: Optional[int] = Query(None, ge=1, le=100_000, description="rows per chunk; defaults to EXPORT_BATCH_SIZE"),
+    service: StudentService = Depends(get_student_service)
+):
+    # Declared before /{student_id}; CSV_COLUMNS headers so the file imports back with import-csv
+    if format == "parquet" and not parquet_available():
+        return render_response(BaseResponse(success=False, error=["Parquet export needs pyarrow installed."]))
+    encode = {"csv": csv_chunks, "ndjson": ndjson_chunks, "parquet": parquet_chunks}[format]
+    media_type, extension = EXPORT_FORMATS[format]
+    return StreamingResponse(
+        encode(service.export_students(batch_size=batch_size), CSV_COLUMNS),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="students.{extension}"'},
+    )
+
+@router.get("/list", response_model=StudentListResponse)
 async def list_students(
+    request: Request,
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100),
     filter_field: Optional[str] = None,
     filter_value: Optional[str] = None,
+    filters: List[str] = Query([], alias="filter",
+                               description="field:op:value, repeatable; op is eq, gte, lte, between (a,b), "
+                                           "in (a,b,...), prefix (student_id, first_name, last_name) or is_null (true/false)"),
     sort_field: Optional[str] = None,
     ascending: bool = True,
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page; switches to keyset paging"),
+    count: str = Query("exact", pattern="^(exact|estimate)$",
+                       description="estimate reads pg_class.reltuples for unfiltered listings"),
+    fields: Optional[str] = Query(None, description="comma-separated columns to return, e.g. student_id,math_score"),
+    since: Optional[datetime] = Query(None, description="only students changed at or after this ISO timestamp; "
+                                                        "pair with sort_field=updated_at and cursor for incremental sync"),
+    if_none_match: Optional[str] = Header(None),
     service: StudentService = Depends(get_student_service)
 ):
+    # Read before the data so the ETag can only be older than what it describes
+    etag = await service.list_etag(request.query_params.multi_items())
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
     sort_by = sort_params(field=sort_field, ascending=ascending) if sort_field else None
     filter_by = filter_params(field=filter_field, value=filter_value) if filter_field and filter_value else None
-    params = request_params(page=page, page_size=page_size, sort_by=sort_by, filter_by=filter_by)
+    try:
+        filter_clauses = [parse_filter(expression) for expression in filters]
+    except ValueError as e:
+        return BaseResponse(success=False, error=[str(e)])
+    params = request_params(page=page, page_size=page_size, sort_by=sort_by, filter_by=filter_by,
+                            filters=filter_clauses, cursor=cursor, count=count, fields=_split_fields(fields),
+                            since=since)
     
-    return await service.get_list_students(params)
+    result = await service.get_list_students(params)
+    return render_response(result, headers={"ETag": etag} if result.success and etag else None)
 
-@router.get("/{student_id}")
-async def get_student(student_id: str, service: StudentService = Depends(get_student_service)):
-    return await service.student_repo.get_student_by_id(student_id)
+@router.get("/{student_id}", response_model=StudentListResponse)
+async def get_student(
+    student_id: str,
+    fields: Optional[str] = Query(None, description="comma-separated columns to return"),
+    if_none_match: Optional[str] = Header(None),
+    service: StudentService = Depends(get_student_service)
+):
+    fields = _split_fields(fields)
+    if if_none_match:
+        etag = await service.student_etag(student_id, fields)
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+    result = await service.get_student(student_id, fields=fields)
+    etag = None
+    if result.success:
+        etag = await service.student_etag(student_id, fields, revision=_revision(result.data[0]))
+    return render_response(result, headers={"ETag": etag} if etag else None)
 
-@router.delete("/{student_id}")
+@router.delete("/{student_id}", response_model=StudentListResponse)
 async def delete_student(student_id: str, service: StudentService = Depends(get_student_service)):
     return await service.delete_student(student_id)
 
-@router.post("/")
+@router.post("/", response_model=StudentListResponse)
 async def create_new_student(student: CreateStudent, service: StudentService = Depends(get_student_service)):
     return await service.create_student(student)
 
-@router.patch("/")
-async def update_existing_student(student: CreateStudent, service: StudentService = Depends(get_student_service)):
-    return await service.update_student(student)
+@router.patch("/", response_model=StudentListResponse)
+async def update_existing_student(student: PatchStudent, service: StudentService = Depends(get_student_service)):
+    return await service.patch_student(student.student_id, _changes(student))
+
+@router.patch("/batch", response_model=BaseResponse[dict])
+async def update_students(
+    students: List[PatchStudent],
+    batch_size: Optional[int] = Query(None, ge=1, description="rows per statement; defaults to UPSERT_BATCH_SIZE"),
+    service: StudentService = Depends(get_student_service)
+):
+    return await service.patch_students([(student.student_id, _changes(student)) for student in students],
+                                        batch_size=batch_size)
+
+@router.get("/analysis/points", response_model=AnalysisResponse)
+async def analyze_student_points(
+    hometown: Optional[str] = None,
+    live: Optional[bool] = Query(None, description="aggregate the students table instead of the maintained summary; "
+                                                   "defaults to the USE_SCORE_STATS setting"),
+    service: StudentService = Depends(get_student_service)
+):
+    return await service.analysis_point(hometown=hometown, live=live)
+
+@router.get("/analysis/summary", response_model=AnalysisResponse)
+async def analyze_summary(service: StudentService = Depends(get_student_service)):
+    return await service.analysis_summary()
+
+@router.get("/analysis/histogram", response_model=AnalysisResponse)
+async def analyze_histogram(
+    bins: int = Query(10, ge=1, le=1000),
+    low: float = 0.0,
+    high: float = 10.0,
+    service: StudentService = Depends(get_student_service)
+):
+    if high <= low:
+        return BaseResponse(success=False, error=["high must be greater than low."])
+    return await service.analysis_histogram(bins=bins, low=low, high=high)
+
+@router.get("/analysis/percentiles", response_model=AnalysisResponse)
+async def analyze_percentiles(
+    q: List[float] = Query([10, 25, 50, 75, 90]),
+    service: StudentService = Depends(get_student_service)
+):
+    if any(p < 0 or p > 100 for p in q):
+        return BaseResponse(success=False, error=["Percentiles must be between 0 and 100."])
+    return await service.analysis_percentiles(q=q)
+
+@router.get("/analysis/correlation", response_model=AnalysisResponse)
+async def analyze_correlation(service: StudentService = Depends(get_student_service)):
+    return await service.analysis_correlation()
 
-@router.get("/analysis/points")
-async def analyze_student_points(service: StudentService = Depends(get_student_service)):
-    return await service.analysis_point()
\ No newline at end of file
+@router.get("/analysis/hometowns", response_model=AnalysisResponse)
+async def analyze_hometowns(service: StudentService = Depends(get_student_service)):
+    return await service.analysis_hometowns()
@@ -1,5 +1,7 @@
-from typing import Optional
+from datetime import datetime
+from typing import List, Optional
 from pydantic import BaseModel
+from app.models.base_model import BaseResponse
 
 class CreateStudent(BaseModel):
     student_id: str
@@ -23,5 +25,20 @@ class StudentUpdate(BaseModel):
     english_score: Optional[float] = None
 
 
+class PatchStudent(StudentUpdate):
+    """A partial update: only the fields present in the request body are changed."""
+    student_id: str
+
+
+class StudentIds(BaseModel):
+    student_ids: List[str]
+
+
 class StudentResponse(CreateStudent):
-    pass
\ No newline at end of file
+    version: Optional[int] = None
+    updated_at: Optional[datetime] = None
+
+
+# response_model of the student routes; with fields= a record only carries the requested keys
+StudentListResponse = BaseResponse[StudentResponse]
+AnalysisResponse = BaseResponse[dict]
\ No newline at end of file
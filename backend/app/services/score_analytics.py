@@ -0,0 +1,115 @@
+"""Vectorized score statistics over ScoreColumns.
+
+Every function makes whole-array NumPy passes instead of looping over students
+and returns plain floats/ints (None for NaN) so results serialize as JSON.
+"""
+from typing import Dict, List, Sequence
+import numpy as np
+from app.models.score_columns import ScoreColumns, SUBJECTS
+from app.repositories.score_stats_repo import EXCELLENT_SCORE, AVERAGE_SCORE
+
+DEFAULT_PERCENTILES = (10, 25, 50, 75, 90)
+
+
+def _value(x):
+    x = float(x)
+    return None if np.isnan(x) else x
+
+
+def summary(columns: ScoreColumns) -> Dict[str, dict]:
+    """Count, mean, stddev, min, max and band percentages per subject.
+
+    Percentages are relative to all students, like /students/analysis/points.
+    """
+    scores = columns.scores
+    total = len(columns)
+    present = ~np.isnan(scores)
+    counts = present.sum(axis=0)
+    filled = np.where(present, scores, 0.0)
+    sums = filled.sum(axis=0)
+    squares = (filled * filled).sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = sums / counts
+        stds = np.sqrt(np.maximum(squares / counts - means * means, 0.0))
+    mins = np.where(present, scores, np.inf).min(axis=0, initial=np.inf)
+    maxs = np.where(present, scores, -np.inf).max(axis=0, initial=-np.inf)
+    excellent = (scores >= EXCELLENT_SCORE).sum(axis=0)
+    average = ((scores >= AVERAGE_SCORE) & (scores < EXCELLENT_SCORE)).sum(axis=0)
+    poor = (scores < AVERAGE_SCORE).sum(axis=0)
+    result = {}
+    for i, subject in enumerate(SUBJECTS):
+        result[subject] = {
+            'count': int(counts[i]),
+            'mean': _value(means[i]) if counts[i] else None,
+            'std': _value(stds[i]) if counts[i] else None,
+            'min': float(mins[i]) if counts[i] else None,
+            'max': float(maxs[i]) if counts[i] else None,
+            'excellent_percentage': excellent[i] / total * 100 if total else 0.0,
+            'average_percentage': average[i] / total * 100 if total else 0.0,
+            'poor_percentage': poor[i] / total * 100 if total else 0.0,
+        }
+    return result
+
+
+def histogram(columns: ScoreColumns, bins: int = 10, low: float = 0.0, high: float = 10.0) -> dict:
+    """Counts per subject over `bins` equal-width bins between low and high."""
+    edges = np.linspace(low, high, bins + 1)
+    counts = {}
+    for i, subject in enumerate(SUBJECTS):
+        column = columns.scores[:, i]
+        counts[subject] = np.histogram(column[~np.isnan(column)], bins=edges)[0].tolist()
+    return {'edges': edges.tolist(), 'counts': counts}
+
+
+def percentiles(columns: ScoreColumns, q: Sequence[float] = DEFAULT_PERCENTILES) -> Dict[str, dict]:
+    q = list(q)
+    result = {}
+    for i, subject in enumerate(SUBJECTS):
+        column = columns.scores[:, i]
+        column = column[~np.isnan(column)]
+        values = np.percentile(column, q) if len(column) else [np.nan] * len(q)
+        result[subject] = {str(p): _value(v) for p, v in zip(q, values)}
+    return result
+
+
+def correlation(columns: ScoreColumns) -> dict:
+    """Pearson correlation matrix across subjects over students that have all three scores."""
+    complete = columns.scores[~np.isnan(columns.scores).any(axis=1)]
+    if len(complete) < 2:
+        matrix = np.full((len(SUBJECTS), len(SUBJECTS)), np.nan)
+    else:
+        with np.errstate(invalid='ignore', divide='ignore'):
+            matrix = np.corrcoef(complete, rowvar=False)
+    return {
+        'subjects': list(SUBJECTS),
+        'students': int(len(complete)),
+        'matrix': [[_value(v) for v in row] for row in matrix],
+    }
+
+
+def hometown_stats(columns: ScoreColumns) -> List[dict]:
+    """Student count and per-subject count/mean/stddev for every hometown, via bincount."""
+    groups = len(columns.hometowns)
+    known = columns.hometown_codes >= 0
+    codes = columns.hometown_codes[known]
+    scores = columns.scores[known]
+    students = np.bincount(codes, minlength=groups)
+    per_subject = []
+    for i in range(len(SUBJECTS)):
+        column = scores[:, i]
+        present = ~np.isnan(column)
+        count = np.bincount(codes[present], minlength=groups)
+        total = np.bincount(codes[present], weights=column[present], minlength=groups)
+        squares = np.bincount(codes[present], weights=column[present] ** 2, minlength=groups)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = total / count
+            std = np.sqrt(np.maximum(squares / count - mean * mean, 0.0))
+        per_subject.append((count, mean, std))
+    result = []
+    for code, hometown in enumerate(columns.hometowns):
+        entry = {'hometown': hometown, 'students': int(students[code])}
+        for subject, (count, mean, std) in zip(SUBJECTS, per_subject):
+            entry[subject] = {'count': int(count[code]), 'mean': _value(mean[code]), 'std': _value(std[code])}
+        result.append(entry)
+    result.sort(key=lambda entry: entry['hometown'])
+    return result
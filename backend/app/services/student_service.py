@@ -1,22 +1,65 @@
-from typing import List
+from datetime import datetime
+from typing import List, Optional, Tuple
 from app.models.student_model import StudentModel
 from app.repositories.student_repo import StudentRepository
+from app.core.config import Settings, get_settings
+from app.repositories.score_stats_repo import SCORE_COLUMNS
+from app.services import score_analytics
+from app.utils.etag import make_etag
 from app.models.base_model import BaseResponse
 
 class StudentService: 
     
-    def __init__(self, student_repo: StudentRepository):
+    def __init__(self, student_repo: StudentRepository, settings: Optional[Settings] = None):
         self.student_repo = student_repo
+        self.settings = settings or get_settings()
     
     async def load_students(self):
         return await self.student_repo.load_students(file_path="seeds/students_100.csv")
     
+    async def import_students(self, file_path: str, chunk_size: Optional[int] = None,
+                              use_copy: Optional[bool] = None, measure_memory: bool = False) -> BaseResponse[dict]:
+        return await self.student_repo.import_students_csv(file_path, chunk_size=chunk_size, use_copy=use_copy,
+                                                           measure_memory=measure_memory)
+    
     async def insert_students(self, students: List[StudentModel]) -> BaseResponse[StudentModel]:
-        print('go to here')
         return await self.student_repo.insert_students(students)
     
+    async def upsert_students(self, students: List[StudentModel],
+                              batch_size: Optional[int] = None) -> BaseResponse[dict]:
+        return await self.student_repo.upsert_students(students, batch_size=batch_size)
+    
     async def get_list_students(self, request_params) -> BaseResponse[StudentModel]:
         return await self.student_repo.get_list_students(request_params)
+    
+    async def list_etag(self, query_items) -> Optional[str]:
+        if not self.settings.enable_etags:
+            return None
+        version = await self.student_repo.get_table_version()
+        return make_etag("students", version, sorted(query_items))
+    
+    def export_students(self, batch_size: Optional[int] = None):
+        return self.student_repo.stream_students(batch_size=batch_size)
+    
+    async def get_student(self, student_id: str, fields: Optional[List[str]] = None) -> BaseResponse[StudentModel]:
+        return await self.student_repo.get_student_by_id(student_id, fields=fields)
+    
+    async def student_etag(self, student_id: str, fields: Optional[List[str]] = None,
+                           revision: Optional[Tuple[int, datetime]] = None) -> Optional[str]:
+        """ETag of one student from its (version, updated_at), looked up when not given."""
+        if not self.settings.enable_etags:
+            return None
+        if revision is None:
+            revision = await self.student_repo.get_student_revision(student_id)
+        if revision is None:
+            return None
+        return make_etag("student", student_id, *revision, fields)
+
+    async def get_students(self, student_ids: List[str], fields: Optional[List[str]] = None) -> BaseResponse[dict]:
+        return await self.student_repo.get_students_by_ids(student_ids, fields=fields)
+    
+    async def delete_students(self, student_ids: List[str]) -> BaseResponse[dict]:
+        return await self.student_repo.delete_students_by_ids(student_ids)
 
     async def delete_student(self, student_id: str) -> BaseResponse[StudentModel]:
         return await self.student_repo.delete_student_by_id(student_id)
@@ -27,40 +70,62 @@ class StudentService:
     async def update_student(self, student: StudentModel) -> BaseResponse[StudentModel]:
         return await self.student_repo.update_student(student)
     
-    async def analysis_point(self) -> BaseResponse[dict]:
-        students = await self.student_repo.get_all_students()
-        if not students.success:
-            return BaseResponse(success=False, error=students.error)
-        total_students = len(students.data) if students.data else 0
+    async def patch_student(self, student_id: str, changes: dict) -> BaseResponse[StudentModel]:
+        return await self.student_repo.patch_student(student_id, changes)
+    
+    async def patch_students(self, patches: List[Tuple[str, dict]],
+                             batch_size: Optional[int] = None) -> BaseResponse[dict]:
+        return await self.student_repo.patch_students(patches, batch_size=batch_size)
+    
+    async def analysis_point(self, hometown: Optional[str] = None, live: Optional[bool] = None) -> BaseResponse[dict]:
+        if live is None:
+            live = not self.settings.use_score_stats
+        if live:
+            summary = await self.student_repo.get_score_summary(hometown)
+        else:
+            summary = await self.student_repo.get_score_stats(hometown)
+        if not summary.success:
+            return BaseResponse(success=False, error=summary.error)
+        row = summary.data[0]
+        total_students = row['total_students']
         if total_students == 0:
             return BaseResponse(success=True, data=[])
-        total_math_excellent = sum(1 for s in students.data if s.math_score is not None and s.math_score >= 8)
-        total_math_average = sum(1 for s in students.data if s.math_score is not None and 5 <= s.math_score < 8)
-        total_math_poor = sum(1 for s in students.data if s.math_score is not None and s.math_score < 5)
-        max_math_point = max(s.math_score for s in students.data if s.math_score is not None)
-        min_math_point = min(s.math_score for s in students.data if s.math_score is not None)
-        math_analysis = {
-            "excellent_percentage": (total_math_excellent / total_students) * 100,
-            "average_percentage": (total_math_average / total_students) * 100,
-            "poor_percentage": (total_math_poor / total_students) * 100,
-            "max_point": max_math_point,
-            "min_point": min_math_point
-        }
-        total_english_excellent = sum(1 for s in students.data if s.english_score is not None and s.english_score >= 8)
-        total_english_average = sum(1 for s in students.data if s.english_score is not None and 5 <= s.english_score < 8)
-        total_english_poor = sum(1 for s in students.data if s.english_score is not None and s.english_score < 5)
-        max_english_point = max(s.english_score for s in students.data if s.english_score is not None)
-        min_english_point = min(s.english_score for s in students.data if s.english_score is not None)
-        english_analysis = {
-            "excellent_percentage": (total_english_excellent / total_students) * 100,
-            "average_percentage": (total_english_average / total_students) * 100,
-            "poor_percentage": (total_english_poor / total_students) * 100,
-            "max_point": max_english_point,
-            "min_point": min_english_point
-        }
-        
         analysis_result = {
-            "math": math_analysis,
-            "english": english_analysis
+            subject: {
+                "excellent_percentage": (row[f"{subject}_excellent"] / total_students) * 100,
+                "average_percentage": (row[f"{subject}_average"] / total_students) * 100,
+                "poor_percentage": (row[f"{subject}_poor"] / total_students) * 100,
+                "max_point": row[f"{subject}_max"],
+                "min_point": row[f"{subject}_min"],
+                "average_point": row[f"{subject}_avg"],
+            }
+            for subject in SCORE_COLUMNS
         }
-        return BaseResponse(success=True, data=[analysis_result])
\ No newline at end of file
+        return BaseResponse(success=True, data=[analysis_result])
+    
+    async def rebuild_score_stats(self) -> BaseResponse[dict]:
+        return await self.student_repo.rebuild_score_stats()
+    
+    async def score_analytics(self, compute, **params) -> BaseResponse[dict]:
+        """Run one of the score_analytics functions over the loaded score columns."""
+        columns = await self.student_repo.load_score_columns()
+        if not columns.success:
+            return BaseResponse(success=False, error=columns.error)
+        result = compute(columns.data[0], **params)
+        return BaseResponse(success=True, data=result if isinstance(result, list) else [result],
+                            total_records=len(columns.data[0]))
+    
+    async def analysis_summary(self) -> BaseResponse[dict]:
+        return await self.score_analytics(score_analytics.summary)
+    
+    async def analysis_histogram(self, bins: int, low: float, high: float) -> BaseResponse[dict]:
+        return await self.score_analytics(score_analytics.histogram, bins=bins, low=low, high=high)
+    
+    async def analysis_percentiles(self, q: List[float]) -> BaseResponse[dict]:
+        return await self.score_analytics(score_analytics.percentiles, q=q)
+    
+    async def analysis_correlation(self) -> BaseResponse[dict]:
+        return await self.score_analytics(score_analytics.correlation)
+    
+    async def analysis_hometowns(self) -> BaseResponse[dict]:
+        return await self.score_analytics(score_analytics.hometown_stats)
@@ -0,0 +1,201 @@
+import asyncio
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+
+class TTLCache:
+    """Small in-process cache whose entries expire ttl seconds after being set.
+
+    When max_size is reached the oldest entry is dropped first.
+    """
+
+    def __init__(self, ttl: float, max_size: int = 1024):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self._entries.pop(key, None)
+            return None
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._entries.pop(key, None)
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class CacheBackend(ABC):
+    """Async key/value cache interface used by the read-through caches.
+
+    Implementations count hits, misses, evictions and invalidations in
+    self.counters; stats() reports them for tuning. delete() and clear() must
+    advance self.generation, which get_or_load uses to drop stale fills. shared
+    is True when every worker process sees the same entries and invalidations;
+    an unshared backend is only coherent while a single process serves writes.
+    """
+
+    shared = False
+
+    def __init__(self):
+        self.counters = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+        self.generation = 0
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Any]:
+        """The cached value, or None on a miss."""
+
+    @abstractmethod
+    async def set(self, key: str, value: Any) -> None:
+        """Store value under key."""
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None:
+        """Invalidate the given keys."""
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Invalidate everything."""
+
+    async def get_or_load(self, key: str, load: Callable[[], Awaitable[Optional[Any]]]) -> Optional[Any]:
+        """Read-through lookup: the cached value, else load()'s result, cached unless it is None.
+
+        A load that overlaps an invalidation may have read the old data, so
+        its result is returned but not kept. Invalidations are seen through
+        generation_of: this process's only, unless the backend is shared.
+        """
+        value = await self.get(key)
+        if value is not None:
+            return value
+        generation = await self.generation_of(key)
+        value = await load()
+        if value is not None and await self.generation_of(key) == generation:
+            await self.set(key, value)
+            # An invalidation that ran while set was awaiting the store
+            if await self.generation_of(key) != generation:
+                await self.delete(key)
+        return value
+
+    async def generation_of(self, key: str) -> Any:
+        """A token that changes whenever key may have been invalidated."""
+        return self.generation
+
+    def stats(self) -> dict:
+        lookups = self.counters["hits"] + self.counters["misses"]
+        return {
+            "backend": type(self).__name__,
+            **self.counters,
+            "hit_ratio": self.counters["hits"] / lookups if lookups else None,
+        }
+
+
+class LRUCache(CacheBackend):
+    """In-process LRU cache with an optional per-entry TTL (seconds, None = no expiry)."""
+
+    def __init__(self, max_size: int = 10_000, ttl: Optional[float] = 300):
+        super().__init__()
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple[Optional[float], Any]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] is not None and entry[0] <= time.monotonic():
+            del self._entries[key]
+            self.counters["evictions"] += 1
+            entry = None
+        if entry is None:
+            self.counters["misses"] += 1
+            return None
+        self._entries.move_to_end(key)
+        self.counters["hits"] += 1
+        return entry[1]
+
+    async def set(self, key: str, value: Any) -> None:
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.counters["evictions"] += 1
+
+    async def delete(self, *keys: str) -> None:
+        self.generation += 1
+        for key in keys:
+            if self._entries.pop(key, None) is not None:
+                self.counters["invalidations"] += 1
+
+    async def clear(self) -> None:
+        self.generation += 1
+        self.counters["invalidations"] += len(self._entries)
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {**super().stats(), "size": len(self._entries), "max_size": self.max_size, "ttl": self.ttl}
+
+
+class ExternalCache(CacheBackend):
+    """Cache backed by an external store such as Redis.
+
+    client needs async get(key) -> bytes | None, set(key, value, ex=seconds) and
+    delete(*keys) -> number deleted, which redis.asyncio.Redis provides; the dict-backed
+    FakeRedis in tests/fakes.py stands in for it locally. Values go through
+    dumps/loads so the store only ever sees bytes or str.
+
+    Invalidations are published through the store: delete() first writes a new
+    token under <prefix>generation:<key>, which generation_of reads, so a fill
+    racing a write in another worker process is dropped too.
+    """
+
+    shared = True
+
+    def __init__(self, client, dumps: Callable[[Any], Any], loads: Callable[[Any], Any],
+                 prefix: str = "", ttl: Optional[int] = 300):
+        super().__init__()
+        self.client = client
+        self.dumps = dumps
+        self.loads = loads
+        self.prefix = prefix
+        self.ttl = ttl
+
+    async def get(self, key: str) -> Optional[Any]:
+        raw = await self.client.get(self.prefix + key)
+        if raw is None:
+            self.counters["misses"] += 1
+            return None
+        self.counters["hits"] += 1
+        return self.loads(raw)
+
+    async def set(self, key: str, value: Any) -> None:
+        await self.client.set(self.prefix + key, self.dumps(value), ex=self.ttl)
+
+    async def generation_of(self, key: str) -> Any:
+        return self.generation, await self.client.get(self._generation_key(key))
+
+    def _generation_key(self, key: str) -> str:
+        return f"{self.prefix}generation:{key}"
+
+    async def delete(self, *keys: str) -> None:
+        self.generation += 1
+        if keys:
+            # Tokens before entries: a fill that checked its token before this write still meets the delete
+            await asyncio.gather(*(self.client.set(self._generation_key(key), uuid.uuid4().hex, ex=self.ttl)
+                                   for key in keys))
+            deleted = await self.client.delete(*(self.prefix + key for key in keys))
+            self.counters["invalidations"] += deleted or 0
+
+    async def clear(self) -> None:
+        # Entries of an external store expire through their TTL; nothing is scanned here
+        self.generation += 1
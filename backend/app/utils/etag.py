@@ -0,0 +1,18 @@
+import hashlib
+from typing import Optional
+
+
+def make_etag(*parts) -> str:
+    """Weak ETag over the given parts; weak because the same data may be encoded differently."""
+    digest = hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: Optional[str]) -> bool:
+    """If-None-Match comparison (RFC 9110 weak comparison) against the current ETag."""
+    if not if_none_match or not etag:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    current = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == current for candidate in if_none_match.split(","))
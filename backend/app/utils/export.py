@@ -0,0 +1,99 @@
+"""Encoders for GET /students/export.
+
+Each takes the async iterator of row-tuple partitions from
+StudentRepository.stream_students and yields bytes one partition at a time, so
+memory stays bounded by the partition size rather than the table size.
+"""
+import csv
+import io
+from typing import AsyncIterator, List, Sequence
+import orjson
+
+# format -> (media type, file extension)
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+
+async def csv_chunks(partitions: AsyncIterator[List[tuple]], columns: Sequence[str]):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    async for rows in partitions:
+        # None becomes an empty cell and dates are written ISO, both of which the importers read back
+        writer.writerows(rows)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+async def ndjson_chunks(partitions: AsyncIterator[List[tuple]], columns: Sequence[str]):
+    async for rows in partitions:
+        yield b"".join(orjson.dumps(dict(zip(columns, row))) + b"\n" for row in rows)
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands back what was written since the last drain.
+
+    It keeps its own position so the Parquet writer's footer offsets stay right.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+async def parquet_chunks(partitions: AsyncIterator[List[tuple]], columns: Sequence[str]):
+    """One row group per partition. Needs pyarrow (optional dependency)."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    types = {
+        "date_of_birth": pa.date32(),
+        "math_score": pa.float64(),
+        "english_score": pa.float64(),
+        "literature_score": pa.float64(),
+    }
+    schema = pa.schema([(name, types.get(name, pa.string())) for name in columns])
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+    try:
+        async for rows in partitions:
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array([row[i] for row in rows], type=field.type) for i, field in enumerate(schema)],
+                schema=schema,
+            ))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
@@ -0,0 +1,116 @@
+from datetime import date, datetime
+from typing import Iterable, List, Optional, Tuple
+from app.models.student import StudentModel as StudentEntity, STUDENT_INDEXES, STUDENT_PATTERN_INDEXES, UNIQUE_FIELDS
+from app.models.request_params import filter_params
+
+# Index column lists the planner can use for students, unique ones first
+QUERY_INDEXES = [(field,) for field in UNIQUE_FIELDS] + list(STUDENT_INDEXES.values())
+
+# Declared whitelist for /students/list: a column is filterable or sortable only
+# if some index leads with it
+FILTERABLE_FIELDS = frozenset(columns[0] for columns in QUERY_INDEXES)
+SORTABLE_FIELDS = frozenset(columns[0] for columns in QUERY_INDEXES)
+# prefix needs a varchar_pattern_ops index; the ones above cannot serve LIKE
+PREFIX_FIELDS = frozenset(STUDENT_PATTERN_INDEXES.values())
+
+DEFAULT_SORT_FIELD = "student_id"
+
+# Operators that pin a column to fixed values vs. ones that select a range of it
+EQUALITY_OPERATORS = ("eq", "in", "is_null")
+RANGE_OPERATORS = ("gte", "lte", "between", "prefix")
+OPERATORS = EQUALITY_OPERATORS + RANGE_OPERATORS
+
+
+def _leads_index(field: str) -> bool:
+    return any(columns[0] == field for columns in QUERY_INDEXES)
+
+
+def unindexed_reason(equality_fields: Iterable[str] = (), range_fields: Iterable[str] = (),
+                     sort_field: Optional[str] = None, enforce_indexes: bool = True) -> Optional[str]:
+    """Why no index can serve this filter/sort combination, or None if one can.
+
+    An index leading with a filtered column serves the filter: only the matching
+    rows are read, then sorted in memory. An index leading with the sort column
+    serves the sort: rows are walked in order and the filters checked on the
+    way. The query is rejected only when neither exists, since PostgreSQL would
+    then scan and sort the whole table. With enforce_indexes=False only the
+    field whitelist is checked.
+    """
+    equality_fields, range_fields = set(equality_fields), set(range_fields)
+    sort_field = sort_field or DEFAULT_SORT_FIELD
+    unknown = sorted((equality_fields | range_fields) - FILTERABLE_FIELDS)
+    if unknown:
+        return f"Cannot filter by {', '.join(unknown)}; filterable fields: {', '.join(sorted(FILTERABLE_FIELDS))}."
+    if sort_field not in SORTABLE_FIELDS:
+        return f"Cannot sort by {sort_field}; sortable fields: {', '.join(sorted(SORTABLE_FIELDS))}."
+    if not enforce_indexes:
+        return None
+    if any(_leads_index(field) for field in equality_fields | range_fields) or _leads_index(sort_field):
+        return None
+    described = [f"{field} = ..." for field in sorted(equality_fields)] + [f"{field} range" for field in sorted(range_fields)]
+    return (f"No index supports filtering by {' and '.join(described) or 'nothing'} "
+            f"sorted by {sort_field}; this query would scan the whole table.")
+
+
+def parse_filter(expression: str) -> filter_params:
+    """Parse a field:op:value query expression; field:is_null may omit the value."""
+    parts = expression.split(":", 2)
+    if len(parts) == 2 and parts[1] == "is_null":
+        parts.append("true")
+    if len(parts) != 3:
+        raise ValueError(f"Invalid filter {expression!r}; expected field:op:value.")
+    field, op, value = parts
+    return filter_params(field=field, op=op, value=value)
+
+
+def _typed(column, raw: str):
+    python_type = column.type.python_type
+    if python_type is float:
+        return float(raw)
+    if python_type is date:
+        return date.fromisoformat(raw)
+    if python_type is datetime:
+        return datetime.fromisoformat(raw)
+    return raw
+
+
+def compile_filters(filters: List[filter_params]) -> Tuple[list, tuple, set, set]:
+    """Typed WHERE conditions for the clauses, all ANDed together.
+
+    Returns (conditions, signature, equality_fields, range_fields); signature is a
+    hashable, order-independent key for the filter set. Raises ValueError for
+    unknown operators or values that do not fit the column type.
+    """
+    conditions, equality_fields, range_fields = [], set(), set()
+    for clause in filters:
+        if clause.op not in OPERATORS:
+            raise ValueError(f"Unknown filter operator {clause.op}; use one of {', '.join(OPERATORS)}.")
+        if clause.field not in FILTERABLE_FIELDS:
+            raise ValueError(f"Cannot filter by {clause.field}; filterable fields: {', '.join(sorted(FILTERABLE_FIELDS))}.")
+        column = getattr(StudentEntity, clause.field)
+        try:
+            if clause.op == "eq":
+                conditions.append(column == _typed(column, clause.value))
+            elif clause.op == "in":
+                conditions.append(column.in_([_typed(column, v) for v in clause.value.split(",")]))
+            elif clause.op == "is_null":
+                is_null = clause.value.strip().lower() in ("true", "1", "yes")
+                conditions.append(column.is_(None) if is_null else column.is_not(None))
+            elif clause.op == "gte":
+                conditions.append(column >= _typed(column, clause.value))
+            elif clause.op == "lte":
+                conditions.append(column <= _typed(column, clause.value))
+            elif clause.op == "between":
+                low, high = clause.value.split(",")
+                conditions.append(column.between(_typed(column, low), _typed(column, high)))
+            elif clause.op == "prefix":
+                if clause.field not in PREFIX_FIELDS:
+                    raise ValueError(f"prefix applies to {', '.join(sorted(PREFIX_FIELDS))} only")
+                # The whole pattern as one parameter, so the planner sees its fixed prefix
+                escaped = clause.value.replace("/", "//").replace("%", "/%").replace("_", "/_")
+                conditions.append(column.like(escaped + "%", escape="/"))
+        except ValueError as e:
+            raise ValueError(f"Invalid value {clause.value!r} for {clause.field}:{clause.op} ({e}).") from e
+        (equality_fields if clause.op in EQUALITY_OPERATORS else range_fields).add(clause.field)
+    signature = tuple(sorted((clause.field, clause.op, clause.value) for clause in filters))
+    return conditions, signature, equality_fields, range_fields
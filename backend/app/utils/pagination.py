@@ -0,0 +1,52 @@
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, List, Tuple
+from sqlalchemy import and_, tuple_
+from sqlalchemy.types import Date, DateTime
+
+
+def encode_cursor(sort_field: str, sort_value: Any, student_id: str) -> str:
+    """Opaque keyset cursor holding the sort key and student_id of the last row of a page."""
+    if isinstance(sort_value, date):
+        sort_value = sort_value.isoformat()
+    payload = json.dumps([sort_field, sort_value, student_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str, sort_field: str, sort_column) -> Tuple[Any, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        field, sort_value, student_id = json.loads(raw)
+        if sort_value is not None and isinstance(sort_column.type, DateTime):
+            sort_value = datetime.fromisoformat(sort_value)
+        elif sort_value is not None and isinstance(sort_column.type, Date):
+            sort_value = date.fromisoformat(sort_value)
+    except (ValueError, TypeError) as e:
+        raise ValueError('Invalid cursor.') from e
+    if field != sort_field:
+        raise ValueError(f'Cursor was issued for sort field {field}, not {sort_field}.')
+    return sort_value, student_id
+
+
+def keyset_segments(sort_column, id_column, last_value: Any, last_id: str, ascending: bool,
+                    nullable: bool = True) -> List:
+    """WHERE clauses for the rows after (last_value, last_id) in (sort_column, id_column) order.
+
+    Follows PostgreSQL's default NULL placement: NULLS LAST when ascending,
+    NULLS FIRST when descending. The clauses select consecutive runs of rows and
+    are meant to be queried one after another until the page is full. Each is a
+    range the (sort_column, id_column) index can use as an index condition.
+    ORing the non-NULL and NULL ranges together would turn the row comparison
+    into a filter over most of the index. NOT NULL columns have no NULL run.
+    """
+    if sort_column is id_column:
+        return [id_column > last_id if ascending else id_column < last_id]
+    if ascending:
+        if last_value is None:
+            return [and_(sort_column.is_(None), id_column > last_id)]
+        after = tuple_(sort_column, id_column) > tuple_(last_value, last_id)
+        return [after, sort_column.is_(None)] if nullable else [after]
+    if last_value is None:
+        return [and_(sort_column.is_(None), id_column < last_id), sort_column.is_not(None)]
+    return [tuple_(sort_column, id_column) < tuple_(last_value, last_id)]
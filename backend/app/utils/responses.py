@@ -0,0 +1,36 @@
+from typing import Optional
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from app.models.base_model import BaseResponse
+
+
+def _default(obj):
+    # orjson handles dicts, dates and floats itself; this only sees Pydantic models
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered by orjson, accepting Pydantic models nested in the content.
+
+    Subclasses JSONResponse rather than the deprecated ORJSONResponse.
+    """
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
+def envelope(result: BaseResponse) -> dict:
+    """The BaseResponse fields as a plain dict, without re-validating or copying data."""
+    return {name: getattr(result, name) for name in BaseResponse.model_fields}
+
+
+def render_response(result: BaseResponse, headers: Optional[dict] = None) -> FastJSONResponse:
+    """Serialize a repository result straight to bytes.
+
+    Returning a Response makes FastAPI skip response_model validation and
+    jsonable_encoder, so the route's response_model only documents the shape.
+    """
+    return FastJSONResponse(envelope(result), headers=headers)
@@ -0,0 +1,84 @@
+"""Microbenchmarks for app.mapper.student_mapping against the previous implementations.
+
+Usage (from /backend):
+    python -m benchmarks.bench_mapping
+    python -m benchmarks.bench_mapping --rows 100000
+"""
+import argparse
+import time
+from datetime import date, datetime
+
+from app.mapper.student_mapping import DateParser, apply_update, to_entity
+from app.models.student import StudentModel as StudentEntity
+from app.models.student_model import StudentModel
+
+
+def old_parse_dob(value):
+    """The previous parse_dob: strptime dd/mm/yyyy, then yyyy-mm-dd after the exception."""
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, '%d/%m/%Y').date()
+    except (ValueError, TypeError):
+        try:
+            return datetime.strptime(value, '%Y-%m-%d').date()
+        except (ValueError, TypeError):
+            return None
+
+
+def old_update(existing, student):
+    """The previous update_student copy: a throwaway entity and its __dict__."""
+    entity = to_entity(student, old_parse_dob)
+    for field, value in entity.__dict__.items():
+        if not field.startswith('_'):
+            setattr(existing, field, value)
+
+
+def timed(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def report(name: str, rows: int, old: float, new: float):
+    print(f"{name:<24} {rows / old:>12.0f} {rows / new:>12.0f} {old / new:>7.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=50_000)
+    args = parser.parse_args()
+    n = args.rows
+
+    dmy = [f"{1 + i % 28:02d}/{1 + i % 12:02d}/2005" for i in range(n)]
+    iso = [f"2005-{1 + i % 12:02d}-{1 + i % 28:02d}" for i in range(n)]
+    students = [
+        StudentModel(student_id=f"SV{i:06d}", first_name="First", last_name="Last", email=f"s{i}@example.com",
+                     dob=iso[i], hometown="Hanoi", math_score=7.5, english_score=8.0, literature_score=6.25)
+        for i in range(n)
+    ]
+    entities = [
+        StudentEntity(student_id=s.student_id, first_name=s.first_name, last_name=s.last_name, email=s.email,
+                      dob=date(2005, 1, 1), hometown=s.hometown, math_score=s.math_score,
+                      english_score=s.english_score, literature_score=s.literature_score, version=1)
+        for s in students
+    ]
+
+    print(f"{'operation':<24} {'old (rows/s)':>12} {'new (rows/s)':>12} {'speedup':>8}")
+    for name, values in (("parse dd/mm/yyyy", dmy), ("parse yyyy-mm-dd", iso)):
+        assert [old_parse_dob(v) for v in values[:100]] == [DateParser()(v) for v in values[:100]]
+        old = timed(lambda: [old_parse_dob(v) for v in values])
+        parse_date = DateParser()
+        new = timed(lambda: [parse_date(v) for v in values])
+        report(name, n, old, new)
+
+    parse_date = DateParser()
+    report("update copy", n, timed(lambda: [old_update(e, s) for e, s in zip(entities, students)]),
+           timed(lambda: [apply_update(e, s, parse_date) for e, s in zip(entities, students)]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Compare the old /students/list serialization path with the orjson row path.
+
+old: ORM entity -> to_domain StudentModel -> BaseResponse -> jsonable_encoder -> json.dumps
+new: row tuple -> dict -> envelope -> orjson
+
+No database is needed; both paths start from rows already fetched. Each path is
+timed twice: serialization alone, and as whole GET /students/list requests through
+the ASGI app (routing, validation, middleware, response) with httpx. The new path
+runs through app.main with a stub service, the old one through a bare app with
+the original route.
+
+Usage (from /backend):
+    python -m benchmarks.bench_serialization
+    python -m benchmarks.bench_serialization --page-sizes 10 100 --seconds 2
+"""
+import argparse
+import asyncio
+import json
+import time
+from datetime import date, datetime, timezone
+
+import httpx
+from fastapi import FastAPI
+from fastapi.encoders import jsonable_encoder
+
+from app.dependencies import get_student_service
+from app.main import app
+from app.mapper.student_mapping import to_domain
+from app.models.base_model import BaseResponse
+from app.models.student import StudentModel as StudentEntity
+from app.models.student_model import StudentModel
+from app.repositories.student_repo import RECORD_COLUMNS
+from app.utils.responses import FastJSONResponse, envelope
+
+
+def make_rows(n: int):
+    return [
+        (f"SV{i:06d}", f"First{i}", f"Last{i}", f"student{i}@example.com", date(2005, 1 + i % 12, 1 + i % 28),
+         "Hanoi", 6.5 + i % 3, 7.25, None if i % 10 == 0 else 8.0, 1,
+         datetime(2026, 1, 1, 12, i % 60, tzinfo=timezone.utc))
+        for i in range(n)
+    ]
+
+
+def old_path(rows) -> bytes:
+    entities = [StudentEntity(**dict(zip(RECORD_COLUMNS, row))) for row in rows]
+    result = BaseResponse[StudentModel](success=True, data=[to_domain(entity) for entity in entities])
+    # What JSONResponse does with the route's return value
+    return json.dumps(jsonable_encoder(result), ensure_ascii=False, allow_nan=False,
+                      separators=(",", ":")).encode("utf-8")
+
+
+def new_path(rows) -> bytes:
+    result = BaseResponse[StudentModel](success=True)
+    result.data = [dict(zip(RECORD_COLUMNS, row)) for row in rows]
+    return FastJSONResponse(envelope(result)).body
+
+
+class StubService:
+    """Answers /students/list from rows in memory, so requests time the HTTP path only."""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def list_etag(self, query_items):
+        return None
+
+    async def get_list_students(self, params):
+        result = BaseResponse[StudentModel](success=True)
+        result.data = [dict(zip(RECORD_COLUMNS, row)) for row in self.rows]
+        return result
+
+
+def old_app(rows) -> FastAPI:
+    """The original route: no response_model, FastAPI encodes the returned model."""
+    old = FastAPI()
+
+    @old.get("/students/list")
+    async def list_students(page: int = 1, page_size: int = 10):
+        entities = [StudentEntity(**dict(zip(RECORD_COLUMNS, row))) for row in rows]
+        return BaseResponse[StudentModel](success=True, data=[to_domain(entity) for entity in entities])
+
+    return old
+
+
+async def requests_per_second(asgi_app, page_size: int, seconds: float) -> float:
+    url = f"/students/list?page=1&page_size={page_size}"
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=asgi_app), base_url="http://bench") as client:
+        (await client.get(url)).raise_for_status()
+        count = 0
+        started = time.perf_counter()
+        while time.perf_counter() - started < seconds:
+            await client.get(url)
+            count += 1
+        return count / (time.perf_counter() - started)
+
+
+def decoded_rows(body: bytes) -> list:
+    # Pydantic writes UTC as "Z", orjson as "+00:00": same instant, compared as datetimes
+    data = json.loads(body)["data"]
+    for row in data:
+        row["updated_at"] = datetime.fromisoformat(row["updated_at"])
+    return data
+
+
+def per_second(fn, rows, seconds: float) -> float:
+    count = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        fn(rows)
+        count += 1
+    return count / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--page-sizes", type=int, nargs="+", default=[10, 100])
+    parser.add_argument("--seconds", type=float, default=1.0, help="run time per path and page size")
+    args = parser.parse_args()
+
+    print(f"{'page size':>10} {'old (resp/s)':>13} {'new (resp/s)':>13} {'speedup':>8}")
+    for size in args.page_sizes:
+        rows = make_rows(size)
+        assert decoded_rows(old_path(rows)) == decoded_rows(new_path(rows))
+        old = per_second(old_path, rows, args.seconds)
+        new = per_second(new_path, rows, args.seconds)
+        print(f"{size:>10} {old:>13.0f} {new:>13.0f} {new / old:>7.1f}x")
+
+    print(f"\n{'page size':>10} {'old (req/s)':>13} {'new (req/s)':>13} {'speedup':>8}")
+    for size in args.page_sizes:
+        rows = make_rows(size)
+        app.dependency_overrides[get_student_service] = lambda: StubService(rows)
+        old = asyncio.run(requests_per_second(old_app(rows), size, args.seconds))
+        new = asyncio.run(requests_per_second(app, size, args.seconds))
+        print(f"{size:>10} {old:>13.0f} {new:>13.0f} {new / old:>7.1f}x")
+    app.dependency_overrides.clear()
+
+
+if __name__ == "__main__":
+    main()
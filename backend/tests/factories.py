@@ -0,0 +1,10 @@
+from app.models.student_model import StudentModel
+
+
+def make_student(index: int, **overrides) -> StudentModel:
+    """A valid student SV<index>; keyword arguments override single fields."""
+    fields = dict(student_id=f"SV{index:04d}", first_name="First", last_name="Last",
+                  email=f"student{index}@example.com", dob="2005-01-31", hometown="Hanoi",
+                  math_score=7.5, english_score=8.0, literature_score=6.5)
+    fields.update(overrides)
+    return StudentModel(**fields)
@@ -0,0 +1,26 @@
+import time
+from typing import Optional
+
+
+class FakeRedis:
+    """In-memory stand-in for redis.asyncio.Redis: the get, set(ex=) and delete that ExternalCache uses."""
+
+    def __init__(self):
+        self.store = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self.store.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self.store[key]
+            return None
+        return value
+
+    async def set(self, key: str, value, ex: Optional[int] = None) -> None:
+        self.store[key] = (value.encode() if isinstance(value, str) else value,
+                           time.monotonic() + ex if ex else None)
+
+    async def delete(self, *keys: str) -> int:
+        return sum(self.store.pop(key, None) is not None for key in keys)
@@ -0,0 +1,126 @@
+import time
+import pytest
+
+from app.models.student_model import StudentModel
+from app.repositories import student_repo
+from app.utils.cache import CacheBackend, ExternalCache, LRUCache
+from tests.factories import make_student
+from tests.fakes import FakeRedis
+
+pytestmark = pytest.mark.anyio
+
+
+def external_cache(client=None, ttl=300) -> ExternalCache:
+    return ExternalCache(client or FakeRedis(), dumps=lambda student: student.model_dump_json(),
+                         loads=StudentModel.model_validate_json, prefix="test:", ttl=ttl)
+
+
+@pytest.fixture(params=["lru", "external"])
+def backend(request) -> CacheBackend:
+    return LRUCache(max_size=10, ttl=300) if request.param == "lru" else external_cache()
+
+
+def test_backend_interface_is_abstract():
+    with pytest.raises(TypeError):
+        CacheBackend()
+
+
+async def test_round_trip_and_counters(backend):
+    student = make_student(1)
+    assert await backend.get("student:SV0001") is None
+    await backend.set("student:SV0001", student)
+    assert await backend.get("student:SV0001") == student
+    await backend.delete("student:SV0001", "student:missing")
+    assert await backend.get("student:SV0001") is None
+    stats = backend.stats()
+    assert (stats["hits"], stats["misses"], stats["invalidations"]) == (1, 2, 1)
+    assert stats["hit_ratio"] == pytest.approx(1 / 3)
+
+
+async def test_lru_evicts_least_recently_used():
+    cache = LRUCache(max_size=2, ttl=None)
+    await cache.set("a", 1)
+    await cache.set("b", 2)
+    await cache.get("a")
+    await cache.set("c", 3)
+    assert await cache.get("b") is None
+    assert (await cache.get("a"), await cache.get("c")) == (1, 3)
+    assert cache.stats()["evictions"] == 1
+
+
+async def test_lru_entries_expire():
+    cache = LRUCache(max_size=2, ttl=0)
+    await cache.set("a", 1)
+    assert await cache.get("a") is None
+    assert cache.stats()["evictions"] == 1
+
+
+async def test_external_cache_prefixes_keys_and_passes_ttl():
+    client = FakeRedis()
+    cache = external_cache(client, ttl=300)
+    started = time.monotonic()
+    await cache.set("student:SV0001", make_student(1))
+    assert list(client.store) == ["test:student:SV0001"]
+    _, expires_at = client.store["test:student:SV0001"]
+    assert started + 300 <= expires_at <= time.monotonic() + 300
+
+
+async def test_get_or_load_fills_once(backend):
+    loads = []
+
+    async def load():
+        loads.append(1)
+        return make_student(1)
+
+    assert await backend.get_or_load("student:SV0001", load) == make_student(1)
+    assert await backend.get_or_load("student:SV0001", load) == make_student(1)
+    assert len(loads) == 1
+
+
+async def test_get_or_load_drops_a_fill_that_overlapped_an_invalidation(backend):
+    async def stale_load():
+        # A write commits and invalidates while this read is in flight
+        await backend.delete("student:SV0001")
+        return make_student(1, math_score=1.0)
+
+    assert (await backend.get_or_load("student:SV0001", stale_load)).math_score == 1.0
+    assert await backend.get("student:SV0001") is None
+
+
+async def test_external_cache_drops_a_fill_invalidated_by_another_worker():
+    # Two worker processes, each with its own ExternalCache object over one store
+    client = FakeRedis()
+    worker, other_worker = external_cache(client), external_cache(client)
+
+    async def stale_load():
+        await other_worker.delete("student:SV0001")
+        return make_student(1, math_score=1.0)
+
+    assert (await worker.get_or_load("student:SV0001", stale_load)).math_score == 1.0
+    assert await worker.get("student:SV0001") is None
+    assert worker.shared and not LRUCache().shared
+
+
+async def test_get_or_load_does_not_cache_missing_rows(backend):
+    async def load():
+        return None
+
+    assert await backend.get_or_load("student:SV0404", load) is None
+    assert await backend.get("student:SV0404") is None
+
+
+async def test_writes_invalidate_only_the_rows_they_touch(repo):
+    cache = external_cache()
+    student_repo.configure_student_cache(cache)
+    await repo.upsert_students([make_student(1), make_student(2)])
+    await repo.get_student_by_id("SV0001")
+    await repo.get_student_by_id("SV0002")
+
+    await repo.patch_student("SV0002", {"math_score": 4.0})
+    assert await cache.get("student:SV0001") is not None
+    assert await cache.get("student:SV0002") is None
+    assert (await repo.get_student_by_id("SV0002")).data[0].math_score == 4.0
+
+    await repo.delete_student_by_id("SV0001")
+    assert await cache.get("student:SV0001") is None
+    assert not (await repo.get_student_by_id("SV0001")).success
@@ -0,0 +1,75 @@
+import pytest
+
+from app.models.request_params import filter_params, request_params
+from app.utils import filtering
+from app.utils.filtering import compile_filters, parse_filter, unindexed_reason
+from tests.factories import make_student
+
+
+def reason_for(filters, sort_field=None):
+    _, _, equality_fields, range_fields = compile_filters(filters)
+    return unindexed_reason(equality_fields, range_fields, sort_field)
+
+
+# What StudentPage.jsx sends: filter_field/filter_value (eq) with sort_field
+@pytest.mark.parametrize("filter_field", ["first_name", "student_id", "hometown"])
+@pytest.mark.parametrize("sort_field", ["student_id", "math_score"])
+def test_frontend_filter_and_sort_combinations_are_accepted(filter_field, sort_field):
+    assert reason_for([filter_params(field=filter_field, value="An")], sort_field) is None
+
+
+@pytest.mark.parametrize("sort_field", ["student_id", "math_score", "hometown", "updated_at"])
+def test_unfiltered_listing_on_any_sortable_field_is_accepted(sort_field):
+    assert reason_for([], sort_field) is None
+
+
+def test_unknown_fields_are_rejected():
+    assert "Cannot sort by dob" in unindexed_reason(sort_field="dob")
+    assert "Cannot filter by dob" in unindexed_reason(equality_fields=["dob"])
+
+
+def test_rejected_when_no_index_serves_filter_or_sort(monkeypatch):
+    # Only the primary key indexed: a hometown filter sorted by math_score would scan everything
+    monkeypatch.setattr(filtering, "QUERY_INDEXES", [("student_id",)])
+    reason = reason_for([filter_params(field="hometown", value="Hanoi")], "math_score")
+    assert reason.startswith("No index supports filtering by hometown = ...")
+    assert reason_for([filter_params(field="hometown", value="Hanoi")], "student_id") is None
+    assert reason_for([filter_params(field="student_id", value="SV1")], "math_score") is None
+
+
+def test_enforcement_can_be_switched_off(monkeypatch):
+    monkeypatch.setattr(filtering, "QUERY_INDEXES", [("student_id",)])
+    assert unindexed_reason(equality_fields=["hometown"], sort_field="math_score", enforce_indexes=False) is None
+
+
+def test_compile_filters_types_values_and_splits_operators():
+    conditions, signature, equality_fields, range_fields = compile_filters([
+        parse_filter("math_score:between:5,8"),
+        parse_filter("hometown:in:Hanoi,Hue"),
+        parse_filter("english_score:is_null"),
+    ])
+    assert len(conditions) == 3
+    assert equality_fields == {"hometown", "english_score"}
+    assert range_fields == {"math_score"}
+    assert signature == tuple(sorted(signature))
+    with pytest.raises(ValueError):
+        compile_filters([parse_filter("math_score:gte:high")])
+    with pytest.raises(ValueError):
+        compile_filters([parse_filter("hometown:like:H")])
+
+
+def test_prefix_is_limited_to_fields_with_a_pattern_index():
+    compile_filters([parse_filter("first_name:prefix:An")])
+    with pytest.raises(ValueError, match="prefix applies to first_name, last_name, student_id only"):
+        compile_filters([parse_filter("hometown:prefix:Ha")])
+
+
+@pytest.mark.anyio
+async def test_prefix_matches_wildcards_literally(repo):
+    names = ["An_1", "An%2", "Anh", "an_3"]
+    await repo.upsert_students([make_student(i, first_name=name) for i, name in enumerate(names)])
+    for prefix, expected in (("An_", ["An_1"]), ("An%", ["An%2"]), ("An", ["An_1", "An%2", "Anh"])):
+        result = await repo.get_list_students(request_params(
+            page=1, page_size=10, filters=[parse_filter(f"first_name:prefix:{prefix}")]))
+        assert result.success, result.error
+        assert sorted(row["first_name"] for row in result.data) == sorted(expected)
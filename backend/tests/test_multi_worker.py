@@ -0,0 +1,57 @@
+import pytest
+from sqlalchemy import text
+
+from app.models.request_params import request_params
+from app.repositories import student_repo
+from app.repositories.student_repo import StudentRepository
+from tests.factories import make_student
+from tests.test_cache import external_cache
+
+pytestmark = pytest.mark.anyio
+
+
+async def write_from_another_worker(session_factory, statement: str):
+    """A write whose invalidations reach only the other worker's caches."""
+    async with session_factory() as session:
+        await session.execute(text(statement))
+        await session.commit()
+
+
+@pytest.fixture
+def multi_worker_repo(repo, session_factory, settings):
+    return StudentRepository(session_factory, settings=settings.model_copy(update={"workers": 4}))
+
+
+async def test_in_process_student_cache_is_bypassed(multi_worker_repo, session_factory):
+    await multi_worker_repo.upsert_students([make_student(1)])
+    assert (await multi_worker_repo.get_student_by_id("SV0001")).data[0].math_score == 7.5
+    revision = await multi_worker_repo.get_student_revision("SV0001")
+
+    await write_from_another_worker(session_factory, "UPDATE students SET math_score = 2, version = version + 1")
+    assert (await multi_worker_repo.get_student_by_id("SV0001")).data[0].math_score == 2.0
+    assert await multi_worker_repo.get_student_revision("SV0001") != revision
+
+
+async def test_single_worker_keeps_its_student_cache(repo, session_factory):
+    await repo.upsert_students([make_student(1)])
+    await repo.get_student_by_id("SV0001")
+    await write_from_another_worker(session_factory, "UPDATE students SET math_score = 2")
+    # Why several workers must not share this: nothing cleared it
+    assert (await repo.get_student_by_id("SV0001")).data[0].math_score == 7.5
+
+
+async def test_shared_student_cache_is_used_by_every_worker(multi_worker_repo):
+    cache = external_cache()
+    student_repo.configure_student_cache(cache)
+    await multi_worker_repo.upsert_students([make_student(1)])
+    await multi_worker_repo.get_student_by_id("SV0001")
+    assert await cache.get("student:SV0001") is not None
+
+
+async def test_count_cache_is_bypassed(multi_worker_repo, session_factory):
+    await multi_worker_repo.upsert_students([make_student(1)])
+    params = request_params(page=1, page_size=10)
+    assert (await multi_worker_repo.get_list_students(params)).total_records == 1
+
+    await write_from_another_worker(session_factory, "DELETE FROM students")
+    assert (await multi_worker_repo.get_list_students(params)).total_records == 0
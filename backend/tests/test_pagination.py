@@ -0,0 +1,68 @@
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.models.request_params import request_params, sort_params
+from app.models.student import StudentModel as StudentEntity
+from app.utils.pagination import decode_cursor, encode_cursor, keyset_segments
+from tests.factories import make_student
+
+
+def sql(clause) -> str:
+    return str(clause.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor("math_score", 7.5, "SV0001")
+    assert decode_cursor(cursor, "math_score", StudentEntity.math_score) == (7.5, "SV0001")
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, "hometown", StudentEntity.hometown)
+
+
+def test_segments_keep_the_row_comparison_on_its_own():
+    segments = keyset_segments(StudentEntity.math_score, StudentEntity.student_id, 7.5, "SV0001", ascending=True)
+    assert [sql(segment) for segment in segments] == [
+        "(students.math_score, students.student_id) > (7.5, 'SV0001')",
+        "students.math_score IS NULL",
+    ]
+
+
+def test_not_null_sort_column_has_no_null_segment():
+    segments = keyset_segments(StudentEntity.updated_at, StudentEntity.student_id, "2026-01-01", "SV0001",
+                               ascending=True, nullable=False)
+    assert len(segments) == 1
+    assert "NULL" not in sql(segments[0])
+
+
+def test_descending_walks_nulls_first():
+    segments = keyset_segments(StudentEntity.math_score, StudentEntity.student_id, None, "SV0005", ascending=False)
+    assert [sql(segment) for segment in segments] == [
+        "students.math_score IS NULL AND students.student_id < 'SV0005'",
+        "students.math_score IS NOT NULL",
+    ]
+
+
+async def walk(repo, sort_field: str, ascending: bool, page_size: int = 3) -> list:
+    seen, cursor = [], None
+    while True:
+        result = await repo.get_list_students(request_params(
+            page=1, page_size=page_size, sort_by=sort_params(field=sort_field, ascending=ascending), cursor=cursor))
+        assert result.success, result.error
+        seen.extend(row["student_id"] for row in result.data)
+        cursor = result.next_cursor
+        if not cursor:
+            return seen
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("ascending", [True, False])
+async def test_cursor_pages_cross_null_sort_keys(repo, ascending):
+    scores = [5.0, None, 7.0, 5.0, None, 9.0, None, 5.0, 7.0, None, 1.0]
+    await repo.upsert_students([make_student(i, math_score=score) for i, score in enumerate(scores)])
+    present = sorted((score, f"SV{i:04d}") for i, score in enumerate(scores) if score is not None)
+    missing = sorted(f"SV{i:04d}" for i, score in enumerate(scores) if score is None)
+    if ascending:
+        expected = [student_id for _, student_id in present] + missing
+    else:
+        expected = missing[::-1] + [student_id for _, student_id in present[::-1]]
+    for page_size in (1, 2, 3, 4, 20):
+        assert await walk(repo, "math_score", ascending, page_size) == expected
@@ -0,0 +1,62 @@
+import pytest
+from tests.factories import make_student
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_patch_clears_a_score(client, repo):
+    await repo.upsert_students([make_student(1)])
+    response = await client.patch("/students/", json={"student_id": "SV0001", "math_score": None})
+    body = response.json()
+    assert body["success"], body["error"]
+    assert body["data"][0]["math_score"] is None
+    assert body["data"][0]["english_score"] == 8.0
+    assert (await repo.get_student_by_id("SV0001")).data[0].math_score is None
+
+
+async def test_patch_returns_the_same_model_as_a_lookup(repo):
+    await repo.upsert_students([make_student(1)])
+    patched = (await repo.patch_student("SV0001", {"hometown": "Hue"})).data[0]
+    looked_up = (await repo.get_student_by_id("SV0001")).data[0]
+    assert patched == looked_up
+    assert patched.model_fields_set == looked_up.model_fields_set
+
+
+async def test_patch_clears_dob(repo):
+    await repo.upsert_students([make_student(1)])
+    result = await repo.patch_student("SV0001", {"dob": None})
+    assert result.success, result.error
+    assert result.data[0].dob is None
+
+
+@pytest.mark.parametrize("dob", ["garbage", "31/02/2005", ""])
+async def test_patch_rejects_an_unparseable_dob(client, repo, dob):
+    await repo.upsert_students([make_student(1)])
+    response = await client.patch("/students/", json={"student_id": "SV0001", "dob": dob})
+    body = response.json()
+    assert not body["success"]
+    assert "Invalid dob" in body["error"][0]
+    assert (await repo.get_student_by_id("SV0001")).data[0].dob == "2005-01-31"
+
+
+async def test_batch_patch_rejects_an_unparseable_dob(repo):
+    await repo.upsert_students([make_student(1), make_student(2)])
+    result = await repo.patch_students([("SV0001", {"dob": "31/02/2005"}), ("SV0002", {"dob": "28/02/2005"})])
+    assert result.data[0]["updated"] == ["SV0002"]
+    assert [item["student_id"] for item in result.data[0]["rejected"]] == ["SV0001"]
+    assert (await repo.get_student_by_id("SV0001")).data[0].dob == "2005-01-31"
+
+
+async def test_batch_patch_with_a_column_null_in_every_row(client, repo):
+    await repo.upsert_students([make_student(i) for i in range(4)])
+    response = await client.patch("/students/batch", params={"batch_size": 2}, json=[
+        {"student_id": f"SV{i:04d}", "math_score": None, "literature_score": 9.0 if i % 2 else None}
+        for i in range(4)
+    ])
+    body = response.json()
+    assert body["success"], body["error"]
+    assert sorted(body["data"][0]["updated"]) == ["SV0000", "SV0001", "SV0002", "SV0003"]
+    first = (await repo.get_student_by_id("SV0000")).data[0]
+    second = (await repo.get_student_by_id("SV0001")).data[0]
+    assert (first.math_score, first.literature_score) == (None, None)
+    assert (second.math_score, second.literature_score) == (None, 9.0)
@@ -0,0 +1,80 @@
+import pytest
+
+from app.models.request_params import request_params
+from app.repositories.student_repo import StudentRepository
+from app.services.student_service import StudentService
+from tests.factories import make_student
+
+pytestmark = pytest.mark.anyio
+
+LIST_QUERY = [("page", "1"), ("page_size", "10")]
+
+
+@pytest.fixture
+def routed_repo(repo, session_factory, replica_session_factory, settings):
+    # Writes to the primary database, reads from the second one until it writes
+    return StudentRepository(session_factory, settings=settings, read_session_factory=replica_session_factory)
+
+
+@pytest.fixture
+def replica_writer(replica_session_factory, settings):
+    # Puts rows on the "replica" directly, as replication would
+    return StudentRepository(replica_session_factory, settings=settings)
+
+
+async def listed_ids(repo) -> list:
+    result = await repo.get_list_students(request_params(page=1, page_size=10))
+    assert result.success, result.error
+    return [row["student_id"] for row in result.data]
+
+
+async def test_reads_use_the_replica_until_the_repository_writes(routed_repo, replica_writer):
+    await replica_writer.upsert_students([make_student(1)])
+    assert await listed_ids(routed_repo) == ["SV0001"]
+    assert [student.student_id for student in (await routed_repo.get_all_students()).data] == ["SV0001"]
+
+    await routed_repo.upsert_students([make_student(2)])
+    # Read-your-writes: the primary from now on
+    assert await listed_ids(routed_repo) == ["SV0002"]
+
+
+async def test_without_a_replica_reads_use_the_primary(repo, replica_writer):
+    await replica_writer.upsert_students([make_student(1)])
+    await StudentRepository(repo.session_factory).upsert_students([make_student(2)])
+    assert await listed_ids(StudentRepository(repo.session_factory)) == ["SV0002"]
+
+
+async def test_student_cache_is_only_filled_from_the_primary(routed_repo, replica_writer, settings):
+    await StudentRepository(routed_repo.session_factory).upsert_students([make_student(1, math_score=9.0)])
+    await replica_writer.upsert_students([make_student(1, math_score=1.0)])
+    assert (await routed_repo.get_student_by_id("SV0001")).data[0].math_score == 9.0
+
+    uncached = StudentRepository(routed_repo.session_factory, settings=settings.model_copy(update={"enable_student_cache": False}),
+                                 read_session_factory=routed_repo.read_session_factory)
+    assert (await uncached.get_student_by_id("SV0001")).data[0].math_score == 1.0
+
+
+async def test_table_version_is_bumped_by_committed_writes_only(repo):
+    assert await repo.get_table_version() == 0
+    await repo.upsert_students([make_student(1), make_student(2)])
+    await repo.patch_student("SV0001", {"math_score": 3.0})
+    assert await repo.get_table_version() == 2
+    # Not found, and a batch the database rejects: nothing committed, no bump
+    await repo.patch_student("SV0404", {"math_score": 3.0})
+    await repo.upsert_students([make_student(3, email="x" * 200)])
+    assert await repo.get_table_version() == 2
+    await repo.delete_students_by_ids(["SV0001", "SV0002"])
+    assert await repo.get_table_version() == 3
+
+
+async def test_list_etag_follows_the_database_the_listing_reads(routed_repo, replica_writer, settings):
+    reader = StudentService(routed_repo, settings=settings)
+    etag = await reader.list_etag(LIST_QUERY)
+    # A write the replica has not received yet: neither the listing nor its ETag change
+    await StudentRepository(routed_repo.session_factory).upsert_students([make_student(1)])
+    assert await reader.list_etag(LIST_QUERY) == etag
+    assert await listed_ids(routed_repo) == []
+    # Once it arrives, the counter row arrives with it
+    await replica_writer.upsert_students([make_student(1)])
+    assert await reader.list_etag(LIST_QUERY) != etag
+    assert await listed_ids(routed_repo) == ["SV0001"]
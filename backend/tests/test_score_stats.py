@@ -0,0 +1,84 @@
+import pytest
+from sqlalchemy import select
+
+from app.models.score_stats import ScoreStatsModel
+from app.repositories.score_stats_repo import COUNTER_FIELDS, RECOMPUTE_SQL
+from tests.factories import make_student
+
+pytestmark = pytest.mark.anyio
+
+CSV_HEADER = "student_id,last_name,first_name,email,date_of_birth,hometown,math_score,english_score,literature_score\n"
+
+
+async def stored_and_recomputed(session_factory):
+    fields = (*COUNTER_FIELDS, "min_score", "max_score")
+    async with session_factory() as session:
+        stored = {(row.scope, row.subject): {field: getattr(row, field) for field in fields}
+                  for row in (await session.execute(select(ScoreStatsModel))).scalars()}
+        fresh = {(row.scope, row.subject): {field: row._mapping[field] for field in fields}
+                 for row in await session.execute(RECOMPUTE_SQL)}
+    return stored, fresh
+
+
+async def assert_stats_match(session_factory):
+    """student_score_stats holds what RECOMPUTE_SQL computes from the students table."""
+    stored, fresh = await stored_and_recomputed(session_factory)
+    # Groups whose students all left keep a row of zeros
+    stored = {key: group for key, group in stored.items() if group["student_count"]}
+    assert stored.keys() == fresh.keys()
+    for key, group in fresh.items():
+        assert stored[key]["score_sum"] == pytest.approx(group["score_sum"]), key
+        assert {**stored[key], "score_sum": None} == {**group, "score_sum": None}, key
+    return stored
+
+
+async def test_every_write_path_keeps_the_summary_in_sync(repo, session_factory, tmp_path):
+    assert (await repo.create_student(make_student(1, math_score=9.5))).success
+    await assert_stats_match(session_factory)
+
+    result = await repo.upsert_students([
+        make_student(1, math_score=3.0),
+        make_student(2, hometown="Hue", english_score=None),
+        make_student(3, hometown="", literature_score=4.0),
+    ])
+    assert result.data[0]["inserted"] == ["SV0002", "SV0003"] and result.data[0]["updated"] == ["SV0001"]
+    await assert_stats_match(session_factory)
+
+    assert (await repo.patch_student("SV0002", {"hometown": "Hanoi", "math_score": 10.0})).success
+    assert (await repo.patch_students([("SV0001", {"english_score": 2.5}), ("SV0003", {"hometown": "Hue"})])).success
+    await assert_stats_match(session_factory)
+
+    roster = tmp_path / "roster.csv"
+    roster.write_text(CSV_HEADER
+                      + "SV0010,Le,An,an@example.com,2005-02-01,Hue,1.5,9.0,\n"
+                      + "SV0011,Ngo,Binh,binh@example.com,,,6.0,5.0,8.5\n", encoding="utf-8")
+    assert (await repo.import_students_csv(str(roster), chunk_size=1)).success
+    await assert_stats_match(session_factory)
+
+    result = await repo.delete_students_by_ids(["SV0002", "SV0010", "SV0404"])
+    assert result.data[0]["missing"] == ["SV0404"]
+    assert (await repo.delete_student_by_id("SV0011")).success
+    await assert_stats_match(session_factory)
+
+
+async def test_min_and_max_are_recomputed_when_the_extreme_leaves(repo, session_factory):
+    await repo.upsert_students([
+        make_student(1, math_score=2.0), make_student(2, math_score=5.5), make_student(3, math_score=9.0),
+    ])
+    await repo.delete_students_by_ids(["SV0003"])
+    await repo.patch_student("SV0001", {"math_score": 4.0})
+    stored = await assert_stats_match(session_factory)
+    assert (stored[("", "math")]["min_score"], stored[("", "math")]["max_score"]) == (4.0, 5.5)
+    assert (stored[("Hanoi", "math")]["min_score"], stored[("Hanoi", "math")]["max_score"]) == (4.0, 5.5)
+
+
+async def test_no_hometown_collides_with_the_global_scope(repo, session_factory):
+    await repo.upsert_students([
+        make_student(1, hometown="*"), make_student(2, hometown=""), make_student(3, hometown=None),
+    ])
+    stored = await assert_stats_match(session_factory)
+    assert stored[("", "math")]["student_count"] == 3
+    assert stored[("*", "math")]["student_count"] == 1
+    assert (await repo.get_score_stats()).data[0]["total_students"] == 3
+    assert (await repo.get_score_stats("*")).data[0]["total_students"] == 1
+    assert (await repo.rebuild_score_stats()).data == []
@@ -0,0 +1,47 @@
+from datetime import date, datetime, timezone
+
+import pytest
+
+from app.mapper.student_mapping import DateParser, parse_dob, to_domain
+from app.models.student import StudentModel as StudentEntity
+
+DOB_CASES = [
+    "31/12/2005", "1/2/2005", "01/02/2005", " 1/2/2005", "2005-12-31", "2005-1-9",
+    "31/12/05", "31/12/205", "31/02/2005", "32/01/2005", "1/13/2005", "001/2/2005", "1/ 2/2005",
+    "+1/2/2005", "1_0/2/2005", "31/12/2005 ", "１/2/2005", "2005/12/31", "", None,
+]
+
+
+def strptime_dob(value):
+    """The original parse: strptime dd/mm/yyyy, then yyyy-mm-dd."""
+    for fmt in ("%d/%m/%Y", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(value, fmt).date()
+        except (ValueError, TypeError):
+            pass
+    return None
+
+
+@pytest.mark.parametrize("value", DOB_CASES)
+def test_parse_dob_accepts_what_strptime_accepted(value):
+    assert parse_dob(value) == strptime_dob(value)
+
+
+def test_two_digit_year_is_rejected():
+    assert parse_dob("31/12/05") is None
+
+
+def test_date_parser_switches_format_within_a_batch():
+    parse_date = DateParser()
+    assert [parse_date(v) for v in ("2005-12-31", "31/12/2005", "nonsense")] == [
+        date(2005, 12, 31), date(2005, 12, 31), None]
+
+
+def test_to_domain_validates_and_keeps_revision_fields():
+    updated_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    entity = StudentEntity(student_id="SV0001", first_name="An", last_name="Le", email="an@example.com",
+                           dob=date(2005, 1, 31), hometown="Hanoi", math_score=7.5, english_score=None,
+                           literature_score=6.0, version=3, updated_at=updated_at)
+    student = to_domain(entity)
+    assert student.dob == "2005-01-31"
+    assert (student.version, student.updated_at) == (3, updated_at)
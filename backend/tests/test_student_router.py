@@ -0,0 +1,59 @@
+import pytest
+from tests.factories import make_student
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_list_with_range_and_equality_filters(client, repo, settings):
+    # The user-009 example, with the default ENFORCE_INDEXED_QUERIES=true
+    assert settings.enforce_indexed_queries
+    await repo.upsert_students([
+        make_student(1, hometown="Hanoi", math_score=9.0),
+        make_student(2, hometown="Hanoi", math_score=7.5),
+        make_student(3, hometown="Hue", math_score=8.5),
+        make_student(4, hometown="Hanoi", math_score=8.0),
+        make_student(5, hometown="Hanoi", math_score=None),
+    ])
+    response = await client.get("/students/list", params=[("filter", "math_score:gte:8"),
+                                                          ("filter", "hometown:eq:Hanoi")])
+    body = response.json()
+    assert body["success"], body["error"]
+    assert [row["student_id"] for row in body["data"]] == ["SV0001", "SV0004"]
+    assert body["total_records"] == 2
+
+
+async def test_list_rejects_badly_typed_filter_values(client):
+    body = (await client.get("/students/list", params={"filter": "math_score:gte:high"})).json()
+    assert not body["success"]
+    assert "math_score:gte" in body["error"][0]
+
+
+async def test_student_etag_and_not_modified(client, repo):
+    await repo.upsert_students([make_student(1)])
+    first = await client.get("/students/SV0001")
+    etag = first.headers["ETag"]
+    again = await client.get("/students/SV0001", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    await client.patch("/students/", json={"student_id": "SV0001", "math_score": 3.0})
+    changed = await client.get("/students/SV0001", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+
+async def test_recreated_student_gets_a_new_etag(client, repo):
+    await repo.upsert_students([make_student(1)])
+    etag = (await client.get("/students/SV0001")).headers["ETag"]
+    await client.delete("/students/SV0001")
+    await repo.upsert_students([make_student(1)])
+    # Same data and version 1 again, but a different row
+    response = await client.get("/students/SV0001", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["data"][0]["version"] == 1
+    assert response.headers["ETag"] != etag
+
+
+async def test_sparse_fieldset_etag_matches_full_lookup(client, repo):
+    await repo.upsert_students([make_student(1)])
+    etag = (await client.get("/students/SV0001", params={"fields": "math_score"})).headers["ETag"]
+    response = await client.get("/students/SV0001", params={"fields": "math_score"}, headers={"If-None-Match": etag})
+    assert response.status_code == 304
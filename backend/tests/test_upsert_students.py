@@ -0,0 +1,36 @@
+import pytest
+from tests.factories import make_student
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_upsert_rows_with_all_null_scores_and_dob(repo):
+    students = [make_student(i, dob=None, math_score=None, english_score=None, literature_score=None)
+                for i in range(3)]
+    result = await repo.upsert_students(students)
+    assert result.success
+    assert result.data[0] == {"inserted": ["SV0000", "SV0001", "SV0002"], "updated": [], "rejected": []}
+    stored = await repo.get_student_by_id("SV0001")
+    assert stored.data[0].dob is None
+    assert stored.data[0].math_score is None
+
+
+async def test_upsert_single_row_without_literature_score(repo):
+    result = await repo.upsert_students([make_student(1, literature_score=None)])
+    assert result.data[0]["inserted"] == ["SV0001"]
+    assert result.data[0]["rejected"] == []
+
+
+async def test_upsert_reports_inserted_updated_and_rejected(repo):
+    await repo.upsert_students([make_student(1)])
+    result = await repo.upsert_students([
+        make_student(1, math_score=None),
+        make_student(2),
+        make_student(3, email="student1@example.com"),
+        make_student(2, email="other@example.com"),
+    ])
+    summary = result.data[0]
+    assert summary["inserted"] == ["SV0002"]
+    assert summary["updated"] == ["SV0001"]
+    assert [(item["row"], item["student_id"]) for item in summary["rejected"]] == [(2, "SV0003"), (3, "SV0002")]
+    assert (await repo.get_student_by_id("SV0001")).data[0].math_score is None
@@ -1,46 +1,93 @@
 """
 Crawler script to fetch student data from local WEBSITE with pagination,
 clean missing scores, export to CSV, and generate visualizations.
-Uses Selenium to crawl from frontend UI.
+Uses Selenium to crawl from frontend UI, or --mode api to page through the
+backend's /students/list directly with concurrent async requests.
 """
 
+import argparse
+import asyncio
+import csv
+import json
+import random
 import time
 import os
+import tracemalloc
+import aiohttp
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import List, Dict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Iterator, List, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import NoSuchElementException
-from random import randint
+from selenium.common.exceptions import WebDriverException
 
-from trio import current_time
+STUDENT_FIELDS = ['student_id', 'first_name', 'last_name', 'email', 'dob', 'hometown', 'math_score', 'english_score', 'literature_score']
+SCORE_FIELDS = ['math_score', 'english_score', 'literature_score']
+# Students per DataFrame chunk in clean_data
+CLEAN_CHUNK_SIZE = 100_000
+# Above this many students generate_visualizations pre-aggregates instead of plotting each one
+EXACT_VIS_MAX_ROWS = 50_000
+# Fine bins per hometown and subject that the aggregated boxplot quartiles are read from
+QUANTILE_BINS = 1000
+VIS_DPI = 300
+SUBJECT_LABELS = {'math_score': 'Math', 'english_score': 'English', 'literature_score': 'Literature'}
+# Largest page_size /students/list accepts
+API_MAX_PAGE_SIZE = 100
+# Ids per POST /students/batch/get (the backend's default BATCH_MAX_IDS)
+BATCH_GET_SIZE = 1000
+# Incremental crawl state, kept in the output directory
+SNAPSHOT_FILE = "students_snapshot.csv"
+STATE_FILE = "crawl_state.json"
+# Retried with backoff; other HTTP errors fail the page immediately
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# The whole table and the "Page X of Y" indicator in one WebDriver round trip
+TABLE_SNAPSHOT_JS = """
+const indicator = document.body.innerText.match(/Page (\\d+) of (\\d+)/);
+return {
+    page: indicator ? Number(indicator[1]) : null,
+    total: indicator ? Number(indicator[2]) : null,
+    rows: Array.from(document.querySelectorAll('table tbody tr'),
+                     row => Array.from(row.cells, cell => cell.innerText.trim())),
+};
+"""
 
 
 class StudentDataCrawler:
-    def __init__(self, frontend_url: str = "http://localhost:5173"):
+    def __init__(self, frontend_url: str = "http://localhost:5173", api_url: str = "http://localhost:8000"):
         self.frontend_url = frontend_url
+        self.api_url = api_url.rstrip('/')
         self.all_students: List[Dict] = []
         self.driver = None
         
-    def _setup_driver(self):
-        """Setup Chrome driver with visible browser."""
+    def _create_driver(self, headless: bool = False):
+        """Chrome driver; visible by default, headless for the parallel pool."""
         chrome_options = Options()
+        if headless:
+            chrome_options.add_argument('--headless=new')
         chrome_options.add_argument('--disable-gpu')
         chrome_options.add_argument('--no-sandbox')
         chrome_options.add_argument('--disable-dev-shm-usage')
         chrome_options.add_argument('--window-size=1920,1080')
         driver_path = os.path.join(os.path.dirname(__file__), '../../drivers/chromedriver.exe')
-        self.driver = webdriver.Chrome(service=Service(driver_path), options=chrome_options)
+        return webdriver.Chrome(service=Service(driver_path), options=chrome_options)
+    
+    def _setup_driver(self, headless: bool = False):
+        """Setup Chrome driver with visible browser."""
+        self.driver = self._create_driver(headless)
     
     def fetch_all_students(self, page_size: int = 10) -> bool:
         """
+        Crawl every page through the UI, waiting on the table rather than fixed sleeps.
+        
         Returns:
             True if successful, False otherwise
         """
@@ -49,21 +96,16 @@ class StudentDataCrawler:
         try:
             self._setup_driver()
             self.driver.get(self.frontend_url)
-            
-            wait = WebDriverWait(self.driver, 20)
-            wait.until(EC.presence_of_element_located((By.TAG_NAME, "table")))
-            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "table tbody tr")))
-            time.sleep(2)
+            snapshot = self._wait_for_page(self.driver, 1)
+            total_pages = snapshot['total']
             
             page = 1
             total_fetched = 0
             
             while True:
                 try:
-                    print(f"Page {page}...", end=" ")
-                    time.sleep(1.5)
-                    
-                    students_on_page = self._extract_table_data()
+                    print(f"Page {page}/{total_pages}...", end=" ")
+                    students_on_page = self._rows_to_students(snapshot['rows'])
                     
                     if not students_on_page:
                         break
@@ -72,11 +114,11 @@ class StudentDataCrawler:
                     total_fetched += len(students_on_page)
                     print(f"✓ {len(students_on_page)} students (Total: {total_fetched})")
                     
-                    if not self._go_to_next_page():
+                    if page >= total_pages or not self._go_to_next_page():
                         break
                     
                     page += 1
-                    time.sleep(1)
+                    snapshot = self._wait_for_page(self.driver, page, previous=snapshot)
                     
                 except Exception as e:
                     print(f"Error: {str(e)}")
@@ -90,78 +132,437 @@ class StudentDataCrawler:
             return False
         finally:
             if self.driver:
-                time.sleep(3)
                 self.driver.quit()
     
-    def _extract_table_data(self) -> List[Dict]:
-        """Extract student data from HTML table."""
-        students = []
+    def fetch_all_students_parallel(self, workers: int = 4) -> bool:
+        """
+        Crawl through the UI with `workers` headless browsers, each on its own page range.
+        
+        Each worker opens its first page directly through the frontend's ?page=N
+        parameter and clicks Next through the rest of its range, so no worker
+        walks the pages before its own. Pages are merged in order.
+        Returns:
+            True if successful, False otherwise
+        """
+        print(f"Crawling from {self.frontend_url} with {workers} headless browsers...")
+        started = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                shards = list(pool.map(lambda shard: self._crawl_shard(shard, workers), range(workers)))
+        except Exception as e:
+            print(f"Error during crawl: {str(e)}")
+            return False
+        pages = sorted(page for shard in shards for page in shard)
+        self.all_students = [student for _, students in pages for student in students]
+        elapsed = time.perf_counter() - started
+        print(f"\nCompleted! Total: {len(self.all_students)} students from {len(pages)} pages in {elapsed:.1f}s")
+        return True
+    
+    def _crawl_shard(self, shard: int, shards: int) -> List[Tuple[int, List[Dict]]]:
+        """(page, students) for this worker's contiguous share of the pages."""
+        driver = self._create_driver(headless=True)
+        try:
+            driver.get(self._page_url(1))
+            snapshot = self._wait_for_page(driver, 1)
+            per_shard = -(-snapshot['total'] // shards)
+            first, last = shard * per_shard + 1, min(snapshot['total'], (shard + 1) * per_shard)
+            if first > last:
+                return []
+            if first > 1:
+                driver.get(self._page_url(first))
+                snapshot = self._wait_for_page(driver, first)
+            pages = []
+            page = first
+            while True:
+                pages.append((page, self._rows_to_students(snapshot['rows'])))
+                if page == last:
+                    break
+                if not self._go_to_next_page(driver):
+                    raise RuntimeError(f"worker {shard}: Next is disabled on page {page}")
+                page += 1
+                snapshot = self._wait_for_page(driver, page, previous=snapshot)
+            print(f"Worker {shard}: pages {first}-{last} ✓")
+            return pages
+        finally:
+            driver.quit()
+    
+    def _page_url(self, page: int) -> str:
+        """frontend_url with ?page=N, which StudentPage opens directly."""
+        parts = urlsplit(self.frontend_url)
+        query = [(key, value) for key, value in parse_qsl(parts.query) if key != 'page'] + [('page', str(page))]
+        return urlunsplit(parts._replace(query=urlencode(query)))
+    
+    def _wait_for_page(self, driver, page: int, previous: Optional[Dict] = None, timeout: float = 20) -> Dict:
+        """Poll the table until it shows `page` with rows different from `previous`; returns the snapshot."""
+        previous_first = previous['rows'][0] if previous and previous['rows'] else None
+        
+        def loaded(d):
+            snapshot = d.execute_script(TABLE_SNAPSHOT_JS)
+            rows = snapshot['rows']
+            # The "Loading data..." placeholder is a single cell
+            if snapshot['page'] != page or not rows or len(rows[0]) < 5 or rows[0] == previous_first:
+                return False
+            return snapshot
+        
+        return WebDriverWait(driver, timeout, poll_frequency=0.05).until(loaded)
+    
+    def fetch_all_students_api(self, page_size: int = API_MAX_PAGE_SIZE, concurrency: int = 8,
+                               retries: int = 3, backoff: float = 0.5) -> bool:
+        """
+        Fetch every page of /students/list, up to `concurrency` requests in flight.
+
+        Fills all_students with the same dicts as the UI crawl, in page order.
+        Returns:
+            True if successful, False otherwise
+        """
+        print(f"Crawling from {self.api_url}/students/list (concurrency {concurrency})...")
+        started = time.perf_counter()
+        try:
+            records = asyncio.run(self._crawl_api(self._fetch_pages, page_size, concurrency, retries, backoff))
+        except Exception as e:
+            print(f"Error during crawl: {str(e)}")
+            return False
+        self.all_students = [{field: record.get(field) for field in STUDENT_FIELDS} for record in records]
+        elapsed = time.perf_counter() - started
+        print(f"\nCompleted! Total: {len(self.all_students)} students in {elapsed:.1f}s")
+        return True
+    
+    def fetch_changed_students_api(self, state_dir: str = "../output", overlap_seconds: float = 60,
+                                   page_size: int = API_MAX_PAGE_SIZE, concurrency: int = 8,
+                                   retries: int = 3, backoff: float = 0.5) -> bool:
+        """
+        Incremental crawl: fetch only students changed since the stored watermark
+        and merge them into the previous snapshot.
+
+        The first run (no snapshot yet) is a full API crawl. The watermark is the
+        newest updated_at seen; each run re-reads from `overlap_seconds` before it
+        so rows from transactions that committed late are not missed. Deletions do
+        not touch updated_at, so when the table size disagrees with the snapshot the
+        ids are reconciled as well. Fills all_students like the other crawl modes.
+        Returns:
+            True if successful, False otherwise
+        """
+        snapshot_path = os.path.join(state_dir, SNAPSHOT_FILE)
+        state_path = os.path.join(state_dir, STATE_FILE)
+        started = time.perf_counter()
+        snapshot, watermark = self._load_snapshot(snapshot_path, state_path)
         try:
-            rows = self.driver.find_elements(By.CSS_SELECTOR, "table tbody tr")
-            for row in rows:
-                cells = row.find_elements(By.TAG_NAME, "td")
-                get_value = lambda cell: cell.text.strip() or None
-                
-                if len(cells) >= 9:
-                    student = {k: get_value(cells[i]) for i, k in enumerate(['student_id', 'first_name', 'last_name', 'email', 'dob', 'hometown', 'math_score', 'english_score', 'literature_score'])}
-                elif len(cells) >= 5:
-                    name_parts = (get_value(cells[0]) or "").split(maxsplit=1)
-                    student = {'student_id': None, 'first_name': name_parts[0] if name_parts else None, 'last_name': name_parts[1] if len(name_parts) > 1 else None, 'email': get_value(cells[1]), 'dob': None, 'hometown': get_value(cells[2]), 'math_score': get_value(cells[3]), 'english_score': get_value(cells[4]), 'literature_score': get_value(cells[5]) if len(cells) > 5 else None}
-                else:
+            if watermark is None:
+                print(f"No snapshot in {state_dir}, crawling everything from {self.api_url}...")
+                records = asyncio.run(self._crawl_api(self._fetch_pages, page_size, concurrency, retries, backoff))
+                snapshot, changed = {}, len(records)
+            else:
+                since = watermark - timedelta(seconds=overlap_seconds)
+                print(f"Fetching students changed since {since.isoformat()} from {self.api_url}...")
+                records, reconciled = asyncio.run(self._crawl_api(
+                    self._fetch_changes, since, snapshot, page_size, concurrency, retries, backoff))
+                snapshot = {student_id: snapshot[student_id] for student_id in reconciled if student_id in snapshot}
+                changed = len(records)
+        except Exception as e:
+            print(f"Error during crawl: {str(e)}")
+            return False
+        for record in records:
+            snapshot[record['student_id']] = {field: record.get(field) for field in STUDENT_FIELDS}
+            if record.get('updated_at'):
+                stamp = datetime.fromisoformat(record['updated_at'])
+                watermark = stamp if watermark is None else max(watermark, stamp)
+        self._save_snapshot(snapshot, watermark, snapshot_path, state_path)
+        self.all_students = [snapshot[student_id] for student_id in sorted(snapshot)]
+        elapsed = time.perf_counter() - started
+        print(f"\nCompleted! {changed} changed, {len(self.all_students)} students in snapshot, {elapsed:.1f}s")
+        return True
+    
+    async def _crawl_api(self, crawl, *args):
+        """Run crawl(session, *args) inside one HTTP session."""
+        timeout = aiohttp.ClientTimeout(total=30)
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            return await crawl(session, *args)
+    
+    async def _fetch_pages(self, session: aiohttp.ClientSession, page_size: int, concurrency: int,
+                           retries: int, backoff: float, fields: Optional[str] = None) -> List[Dict]:
+        """Every record of /students/list by offset pages, fetched concurrently."""
+        limit = asyncio.Semaphore(concurrency)
+        page_size = min(page_size, API_MAX_PAGE_SIZE)
+        params = {'page_size': page_size, 'sort_field': 'student_id'}
+        if fields:
+            params['fields'] = fields
+        # The first page also tells how many pages there are
+        first = await self._request(session, limit, 'GET', '/students/list', retries, backoff, {**params, 'page': 1})
+        pages = max(1, -(-first['total_records'] // page_size))
+        print(f"Page 1/{pages} ✓ ({first['total_records']} students)")
+        rest = await asyncio.gather(*(
+            self._request(session, limit, 'GET', '/students/list', retries, backoff, {**params, 'page': page})
+            for page in range(2, pages + 1)
+        ))
+        records, seen = [], set()
+        for body in (first, *rest):
+            for record in body['data'] or []:
+                # Offset pages can overlap if rows were inserted mid-crawl
+                if record['student_id'] in seen:
                     continue
-                students.append(student)
-        except:
-            pass
+                seen.add(record['student_id'])
+                records.append(record)
+        return records
+    
+    async def _fetch_changes(self, session: aiohttp.ClientSession, since: datetime, snapshot: Dict[str, Dict],
+                             page_size: int, concurrency: int, retries: int, backoff: float):
+        """(changed records, ids that still exist) for an incremental run.
+
+        Changed rows are walked with keyset cursors in updated_at order, so cost
+        follows the number of changes. The id list is only fetched when the table
+        size shows that students were deleted or missed.
+        """
+        limit = asyncio.Semaphore(concurrency)
+        # UTC with a Z suffix: a "+00:00" offset would need escaping in the query string
+        params = {'since': since.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%fZ'),
+                  'sort_field': 'updated_at', 'page_size': min(page_size, API_MAX_PAGE_SIZE)}
+        changed = {}
+        while True:
+            body = await self._request(session, limit, 'GET', '/students/list', retries, backoff, params)
+            for record in body['data'] or []:
+                changed[record['student_id']] = record
+            if not body.get('next_cursor'):
+                break
+            params['cursor'] = body['next_cursor']
+        print(f"{len(changed)} changed students")
+        total = (await self._request(session, limit, 'GET', '/students/list', retries, backoff,
+                                     {'page': 1, 'page_size': 1, 'fields': 'student_id'}))['total_records']
+        known = snapshot.keys() | changed.keys()
+        if total == len(known):
+            return list(changed.values()), known
+        print(f"Table has {total} students, snapshot {len(known)}: reconciling ids...")
+        ids = {record['student_id'] for record in await self._fetch_pages(
+            session, API_MAX_PAGE_SIZE, concurrency, retries, backoff, fields='student_id')}
+        # Present in the table but never seen: fetch them by id
+        missing = sorted(ids - known)
+        for start in range(0, len(missing), BATCH_GET_SIZE):
+            body = await self._request(session, limit, 'POST', '/students/batch/get', retries, backoff,
+                                       json={'student_ids': missing[start:start + BATCH_GET_SIZE]})
+            for record in body['data'][0]['students']:
+                changed[record['student_id']] = record
+        return list(changed.values()), ids
+    
+    async def _request(self, session: aiohttp.ClientSession, limit: asyncio.Semaphore, method: str, path: str,
+                       retries: int, backoff: float, params: Optional[Dict] = None, json: Optional[Dict] = None) -> Dict:
+        """One API call with retries; returns the response body, raising on failure."""
+        for attempt in range(retries + 1):
+            try:
+                async with limit:
+                    async with session.request(method, f"{self.api_url}{path}", params=params, json=json) as response:
+                        if response.status not in RETRY_STATUSES:
+                            response.raise_for_status()
+                            body = await response.json()
+                            if not body.get('success'):
+                                raise RuntimeError(f"{path} {params or ''}: {body.get('error')}")
+                            return body
+                        error = f"HTTP {response.status}"
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                error = f"{type(e).__name__}: {e}"
+            if attempt == retries:
+                raise RuntimeError(f"{path} {params or ''} failed after {retries + 1} attempts ({error})")
+            # Exponential backoff with jitter, outside the semaphore so other pages keep going
+            await asyncio.sleep(backoff * 2 ** attempt * (0.5 + random.random()))
+    
+    def _load_snapshot(self, snapshot_path: str, state_path: str) -> Tuple[Dict[str, Dict], Optional[datetime]]:
+        """Previous snapshot by student_id and its watermark; ({}, None) if there is none."""
+        if not (os.path.exists(snapshot_path) and os.path.exists(state_path)):
+            return {}, None
+        with open(state_path, encoding='utf-8') as file:
+            watermark = json.load(file).get('watermark')
+        with open(snapshot_path, encoding='utf-8', newline='') as file:
+            snapshot = {row['student_id']: {field: row.get(field) or None for field in STUDENT_FIELDS}
+                        for row in csv.DictReader(file)}
+        return snapshot, datetime.fromisoformat(watermark) if watermark else None
+    
+    def _save_snapshot(self, snapshot: Dict[str, Dict], watermark: Optional[datetime],
+                       snapshot_path: str, state_path: str):
+        """Write the snapshot, then the watermark, so a crash never leaves a watermark ahead of its data."""
+        Path(snapshot_path).parent.mkdir(parents=True, exist_ok=True)
+        temporary = snapshot_path + '.tmp'
+        with open(temporary, 'w', encoding='utf-8', newline='') as file:
+            writer = csv.DictWriter(file, fieldnames=STUDENT_FIELDS)
+            writer.writeheader()
+            writer.writerows(snapshot[student_id] for student_id in sorted(snapshot))
+        os.replace(temporary, snapshot_path)
+        with open(state_path, 'w', encoding='utf-8') as file:
+            json.dump({'watermark': watermark.isoformat() if watermark else None}, file)
+    
+    def _rows_to_students(self, rows: List[List[str]]) -> List[Dict]:
+        students = []
+        get_value = lambda text: text.strip() or None
+        for cells in rows:
+            if len(cells) >= 9:
+                student = {k: get_value(cells[i]) for i, k in enumerate(STUDENT_FIELDS)}
+            elif len(cells) >= 5:
+                name_parts = (get_value(cells[0]) or "").split(maxsplit=1)
+                student = {'student_id': None, 'first_name': name_parts[0] if name_parts else None, 'last_name': name_parts[1] if len(name_parts) > 1 else None, 'email': get_value(cells[1]), 'dob': None, 'hometown': get_value(cells[2]), 'math_score': get_value(cells[3]), 'english_score': get_value(cells[4]), 'literature_score': get_value(cells[5]) if len(cells) > 5 else None}
+            else:
+                continue
+            students.append(student)
         return students
     
-    def _go_to_next_page(self) -> bool:
+    def _go_to_next_page(self, driver=None) -> bool:
         """Click next page button."""
         try:
-            next_button = self.driver.find_element(By.XPATH, "//button[contains(text(), 'Next')]")
+            next_button = (driver or self.driver).find_element(By.XPATH, "//button[contains(text(), 'Next')]")
             if next_button.get_attribute('disabled'):
                 return False
             next_button.click()
-            time.sleep(1)
             return True
-        except:
+        except WebDriverException:
             return False
     
-    def clean_data(self) -> pd.DataFrame:
-        """Clean missing scores using hometown averages."""
-        print("\nCleaning data...")
-        df = pd.DataFrame(self.all_students)
+    def clean_data(self, chunk_size: int = CLEAN_CHUNK_SIZE, output_path: Optional[str] = None,
+                   profile_memory: bool = False, release_input: bool = False) -> 'ChartAggregates':
+        """
+        Clean missing scores using hometown averages, chunk_size students at a time.
         
-        for col in ['math_score', 'english_score', 'literature_score']:
-            df[col] = pd.to_numeric(df[col], errors='coerce')
-            hometown_avg = df.groupby('hometown')[col].transform('mean')
-            df[col] = df[col].fillna(hometown_avg).fillna(df[col].mean())
+        Pass 1 accumulates per-hometown score sums and counts and the score range
+        in one grouped aggregation per chunk; pass 2 fills the gaps from those means
+        (or the overall mean for students without a hometown mean). Hometowns are
+        categorical and scores float32. Each cleaned chunk is appended to
+        output_path (the columns that hold any value, scores rounded to one
+        decimal), folded into the chart aggregates and dropped, so memory is
+        bounded by one chunk beyond the crawled records. release_input also drops
+        those records from all_students as pass 2 consumes them. profile_memory reports the peak traced by
+        tracemalloc, which makes cleaning many times slower. Returns the
+        ChartAggregates for generate_visualizations.
+        """
+        print("\nCleaning data...")
+        started = time.perf_counter()
+        if profile_memory:
+            tracemalloc.start()
+        try:
+            # Pass 1: sums and counts per hometown, the score range, and which columns hold any value at all
+            sums = counts = None
+            present = pd.Series(0, index=STUDENT_FIELDS)
+            total_sums = pd.Series(0.0, index=SCORE_FIELDS)
+            total_counts = pd.Series(0, index=SCORE_FIELDS)
+            low, high = np.inf, -np.inf
+            for chunk in self._student_chunks(chunk_size):
+                scores = chunk[SCORE_FIELDS].astype('float64')
+                total_sums += scores.sum()
+                total_counts += scores.count()
+                low, high = min(low, scores.min().min()), max(high, scores.max().max())
+                grouped = scores.groupby(chunk['hometown'], observed=True)
+                chunk_sums, chunk_counts = grouped.sum(), grouped.count()
+                # Plain string index, so chunks with different categories still align
+                chunk_sums.index = chunk_counts.index = chunk_sums.index.astype(str)
+                sums = chunk_sums if sums is None else sums.add(chunk_sums, fill_value=0)
+                counts = chunk_counts if counts is None else counts.add(chunk_counts, fill_value=0)
+                present += chunk.notna().sum()
+            hometowns = sums.index.astype(str).tolist() if sums is not None else []
+            # Filled values are means of existing ones, so the raw range is the cleaned range too
+            if not np.isfinite(low):
+                low, high = 0.0, 10.0
+            aggregates = ChartAggregates(hometowns, low, high)
+            if sums is None:
+                print("Cleaned 0 records")
+                return aggregates
+            with np.errstate(invalid='ignore', divide='ignore'):
+                hometown_means = (sums / counts).astype('float32')
+                # Over every student, including those without a hometown
+                overall_means = (total_sums / total_counts).astype('float32')
+            
+            # Pass 2: fill, write and aggregate each chunk, then let it go
+            export_cols = [col for col in STUDENT_FIELDS if present[col]]
+            # Hometown mean by category code; code -1 (no hometown) picks the trailing NaN
+            lookups = {col: np.append(hometown_means[col].to_numpy(), np.float32(np.nan)) for col in SCORE_FIELDS}
+            for chunk in self._student_chunks(chunk_size, hometowns, release=release_input):
+                codes = chunk['hometown'].cat.codes.to_numpy()
+                for col in SCORE_FIELDS:
+                    filled = chunk[col].to_numpy()
+                    filled = np.where(np.isnan(filled), lookups[col][codes], filled)
+                    chunk[col] = np.where(np.isnan(filled), overall_means[col], filled).astype('float32')
+                if output_path:
+                    out = chunk[export_cols].copy()
+                    for col in SCORE_FIELDS:
+                        if col in out.columns:
+                            out[col] = out[col].astype('float64').round(1)
+                    out.to_csv(output_path, mode='w' if not aggregates.rows else 'a', header=not aggregates.rows,
+                               index=False, encoding='utf-8')
+                aggregates.add(chunk)
+            peak = tracemalloc.get_traced_memory()[1] if profile_memory else None
+        finally:
+            if profile_memory:
+                tracemalloc.stop()
+        elapsed = time.perf_counter() - started
+        rate = aggregates.rows / elapsed if elapsed else float('inf')
+        memory = f", peak memory {peak / 2**20:.1f} MiB" if peak is not None else ""
+        print(f"Cleaned {aggregates.rows} records in {elapsed:.2f}s ({rate:,.0f} rows/s{memory})")
+        if output_path:
+            print(f"Exported: {output_path}")
+        return aggregates
+    
+    def _student_chunks(self, chunk_size: int, hometowns: Optional[List[str]] = None,
+                        release: bool = False) -> Iterator[pd.DataFrame]:
+        """all_students as DataFrames of at most chunk_size rows with compact dtypes.
         
-        print(f"Cleaned {len(df)} records")
-        return df
+        Given the full hometown list, every chunk shares the same categories and
+        category codes. With release, each chunk's records are removed from
+        all_students once the chunk is built.
+        """
+        start = 0
+        while start < len(self.all_students):
+            chunk = pd.DataFrame.from_records(self.all_students[start:start + chunk_size], columns=STUDENT_FIELDS)
+            if release:
+                del self.all_students[:chunk_size]
+            else:
+                start += chunk_size
+            for col in SCORE_FIELDS:
+                chunk[col] = pd.to_numeric(chunk[col], errors='coerce').astype('float32')
+            chunk['hometown'] = pd.Categorical(chunk['hometown'], categories=hometowns)
+            yield chunk
     
-    def export_to_csv(self, df: pd.DataFrame, output_dir: str = "../output") -> str:
-        """Export cleaned data to CSV."""
-        print("Exporting to CSV...")
+    def export_path(self, output_dir: str = "../output") -> str:
+        """Timestamped path for the cleaned CSV that clean_data writes."""
         Path(output_dir).mkdir(parents=True, exist_ok=True)
         current_time = time.strftime("%Y%m%d_%H%M%S")
-        output_path = os.path.join(output_dir, f"students_cleaned_{current_time}.csv")
-        
-        available_cols = [col for col in ['student_id', 'first_name', 'last_name', 'email', 'dob', 'hometown', 'math_score', 'english_score', 'literature_score'] if col in df.columns and not df[col].isna().all()]
-        export_df = df[available_cols].copy()
-        
-        for col in ['math_score', 'english_score', 'literature_score']:
-            if col in export_df.columns:
-                export_df[col] = export_df[col].round(1)
-        
-        export_df.to_csv(output_path, index=False, encoding='utf-8')
-        print(f"Exported: {output_path}")
-        return output_path
+        return os.path.join(output_dir, f"students_cleaned_{current_time}.csv")
     
-    def generate_visualizations(self, df: pd.DataFrame, output_dir: str = "../output"):
-        """Generate 4 visualizations: histogram, boxplot, scatter plot, bar chart."""
-        print("\nGenerating visualizations...")
+    def generate_visualizations(self, aggregates: 'ChartAggregates', output_dir: str = "../output",
+                                mode: str = "auto", workers: int = 4, csv_path: Optional[str] = None) -> str:
+        """
+        Generate 4 visualizations: histogram, boxplot, scatter plot, bar chart.
         
+        mode "aggregate" draws from the ChartAggregates clean_data built (shared-bin
+        histograms, per-hometown quartiles for the boxplots, a binned 2D density
+        instead of the scatter) and renders each chart in its own process on the
+        Agg backend. "exact" reads the cleaned CSV at csv_path back and plots every
+        student in one figure. "auto" picks exact up to EXACT_VIS_MAX_ROWS students
+        when the CSV is available. Returns the path of the PNG.
+        """
+        print("\nGenerating visualizations...")
         Path(output_dir).mkdir(parents=True, exist_ok=True)
+        current_time = time.strftime("%Y%m%d_%H%M%S")
+        output_path = os.path.join(output_dir, f"student_visualizations_{current_time}.png")
+        if mode == "auto":
+            mode = "exact" if csv_path and aggregates.rows <= EXACT_VIS_MAX_ROWS else "aggregate"
+        elif mode == "exact" and not csv_path:
+            print("Exact mode needs the cleaned CSV; drawing from the aggregates instead")
+            mode = "aggregate"
+        started = time.perf_counter()
+        if mode == "exact":
+            df = pd.read_csv(csv_path, encoding='utf-8').reindex(columns=STUDENT_FIELDS)
+            self._render_exact(df, output_path)
+        else:
+            self._render_aggregated(aggregates.panels(), output_path, workers)
+        print(f"Saved: {output_path} ({mode} mode, {time.perf_counter() - started:.1f}s)")
+        return output_path
+    
+    def _render_aggregated(self, panels: List[Tuple[str, Dict]], output_path: str, workers: int):
+        """Render the aggregated panels in a process pool and tile them 2x2 into one PNG."""
+        with ProcessPoolExecutor(max_workers=max(1, min(workers, len(panels)))) as pool:
+            images = list(pool.map(_render_panel, [kind for kind, _ in panels], [data for _, data in panels]))
+        height = max(image.shape[0] for image in images)
+        width = max(image.shape[1] for image in images)
+        # Pad to a common size with white, then 2x2
+        tiles = [np.pad(image, ((0, height - image.shape[0]), (0, width - image.shape[1]), (0, 0)),
+                        constant_values=255) for image in images]
+        plt.imsave(output_path, np.vstack([np.hstack(tiles[:2]), np.hstack(tiles[2:])]))
+    
+    def _render_exact(self, df: pd.DataFrame, output_path: str):
+        """The original renderer: every student plotted in one 300-dpi figure."""
         fig = plt.figure(figsize=(16, 12))
         
         # DIAGRAM 1: Histogram - Score Distribution
@@ -236,41 +637,220 @@ class StudentDataCrawler:
         ax4.grid(True, alpha=0.3, axis='y')
         
         plt.tight_layout()
-        current_time = time.strftime("%Y%m%d_%H%M%S")
-        output_path = os.path.join(output_dir, f"student_visualizations_{current_time}.png")
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
+        plt.savefig(output_path, dpi=VIS_DPI, bbox_inches='tight')
         plt.close()
+
+
+class ChartAggregates:
+    """Running totals behind the aggregated charts, fed one cleaned chunk at a time.
+    
+    Sized by the score range and the number of hometowns, never by the number of
+    students: shared-bin histogram counts, QUANTILE_BINS fine bins and the exact
+    minimum and maximum per hometown and subject for the boxplot quartiles, math x
+    english counts and literature sums for the density, and pass counts.
+    """
+
+    def __init__(self, hometowns: List[str], low: float, high: float):
+        self.hometowns = hometowns
+        self.low = float(low)
+        self.high = float(high) if high > low else self.low + 1.0
+        self.rows = 0
+        self.edges = np.linspace(self.low, self.high, 16)
+        self.histogram = {col: np.zeros(len(self.edges) - 1, dtype=np.int64) for col in SCORE_FIELDS}
+        self.fine = {col: np.zeros((len(hometowns), QUANTILE_BINS), dtype=np.int64) for col in SCORE_FIELDS}
+        self.minimum = {col: np.full(len(hometowns), np.nan) for col in SCORE_FIELDS}
+        self.maximum = {col: np.full(len(hometowns), np.nan) for col in SCORE_FIELDS}
+        self.density_counts = np.zeros((80, 80))
+        self.literature_sums = np.zeros((80, 80))
+        self.passed = {col: 0 for col in SCORE_FIELDS}
+
+    def add(self, chunk: pd.DataFrame):
+        """Fold a cleaned chunk in; its hometown categories must be self.hometowns."""
+        self.rows += len(chunk)
+        codes = chunk['hometown'].cat.codes.to_numpy().astype(np.int64)
+        scores = {col: chunk[col].to_numpy(dtype='float64') for col in SCORE_FIELDS}
+        extremes = chunk[SCORE_FIELDS].groupby(chunk['hometown'], observed=False)
+        minimum, maximum = extremes.min(), extremes.max()
+        for col, values in scores.items():
+            valid = ~np.isnan(values)
+            self.histogram[col] += np.histogram(values[valid], bins=self.edges)[0]
+            self.passed[col] += int((values[valid] >= 7).sum())
+            located = valid & (codes >= 0)
+            bins = np.minimum(((values[located] - self.low) * (QUANTILE_BINS / (self.high - self.low))).astype(np.int64),
+                              QUANTILE_BINS - 1)
+            self.fine[col] += np.bincount(codes[located] * QUANTILE_BINS + bins,
+                                          minlength=len(self.hometowns) * QUANTILE_BINS
+                                          ).reshape(len(self.hometowns), QUANTILE_BINS)
+            self.minimum[col] = np.fmin(self.minimum[col], minimum[col].to_numpy(dtype='float64'))
+            self.maximum[col] = np.fmax(self.maximum[col], maximum[col].to_numpy(dtype='float64'))
+        math, english, literature = (scores[col] for col in SCORE_FIELDS)
+        both = ~(np.isnan(math) | np.isnan(english) | np.isnan(literature))
+        extent = [[self.low, self.high], [self.low, self.high]]
+        self.density_counts += np.histogram2d(math[both], english[both], bins=80, range=extent)[0]
+        self.literature_sums += np.histogram2d(math[both], english[both], bins=80, range=extent,
+                                               weights=literature[both])[0]
+
+    def panels(self) -> List[Tuple[str, Dict]]:
+        """(panel kind, small NumPy summary) for each chart, as _render_panel takes them."""
+        histogram = {'edges': self.edges,
+                     'counts': {SUBJECT_LABELS[col]: self.histogram[col] for col in SCORE_FIELDS}}
+        
+        boxes = []
+        for index, hometown in sorted(enumerate(self.hometowns), key=lambda item: item[1]):
+            for col in SCORE_FIELDS:
+                counts = self.fine[col][index]
+                if not counts.any():
+                    continue
+                q1, median, q3 = np.clip(_binned_quantiles(counts, self.low, self.high, [0.25, 0.5, 0.75]),
+                                         self.minimum[col][index], self.maximum[col][index])
+                iqr = q3 - q1
+                # Whiskers at 1.5 IQR clipped to the data range (outliers are not drawn)
+                boxes.append({'hometown': hometown, 'subject': SUBJECT_LABELS[col], 'med': median, 'q1': q1, 'q3': q3,
+                              'whislo': max(self.minimum[col][index], q1 - 1.5 * iqr),
+                              'whishi': min(self.maximum[col][index], q3 + 1.5 * iqr)})
+        
+        edges = np.linspace(self.low, self.high, 81)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            literature_mean = np.where(self.density_counts > 0, self.literature_sums / self.density_counts, np.nan)
+        density = {'x_edges': edges, 'y_edges': edges, 'literature_mean': literature_mean,
+                   'low': self.low, 'high': self.high}
         
-        print(f"Saved: {output_path}")
+        passed = {'subjects': [SUBJECT_LABELS[col] for col in SCORE_FIELDS],
+                  'counts': [self.passed[col] for col in SCORE_FIELDS], 'total': self.rows}
+        return [('histogram', histogram), ('boxplot', {'boxes': boxes}), ('density', density), ('passed', passed)]
+
+
+def _binned_quantiles(counts: np.ndarray, low: float, high: float, qs: List[float]) -> np.ndarray:
+    """Quantiles of values counted in equal bins over [low, high], interpolated within their bin."""
+    cumulative = np.cumsum(counts)
+    targets = np.asarray(qs) * cumulative[-1]
+    bins = np.minimum(np.searchsorted(cumulative, targets), len(counts) - 1)
+    before = np.where(bins > 0, cumulative[bins - 1], 0)
+    fraction = (targets - before) / np.maximum(counts[bins], 1)
+    return low + (bins + fraction) * (high - low) / len(counts)
+
+
+def _render_panel(kind: str, data: Dict) -> np.ndarray:
+    """Draw one aggregated chart on the Agg backend; runs in a worker process.
+    
+    Returns the rendered panel as a uint8 RGBA array.
+    """
+    plt.switch_backend('Agg')
+    fig, ax = plt.subplots(figsize=(8, 6))
+    if kind == 'histogram':
+        edges = data['edges']
+        for label, counts in data['counts'].items():
+            ax.stairs(counts, edges, fill=True, alpha=0.6, label=label, edgecolor='black')
+        ax.set_xlabel('Score', fontsize=11)
+        ax.set_ylabel('Frequency', fontsize=11)
+        ax.set_title('Score Distribution Histogram', fontsize=12, fontweight='bold')
+        ax.legend()
+        ax.grid(True, alpha=0.3)
+    elif kind == 'boxplot':
+        hometowns = list(dict.fromkeys(box['hometown'] for box in data['boxes']))
+        subjects = list(SUBJECT_LABELS.values())
+        colors = sns.color_palette(n_colors=len(subjects))
+        width = 0.8 / len(subjects)
+        for i, subject in enumerate(subjects):
+            boxes = [box for box in data['boxes'] if box['subject'] == subject]
+            positions = [hometowns.index(box['hometown']) + (i - (len(subjects) - 1) / 2) * width for box in boxes]
+            artists = ax.bxp(boxes, positions=positions, widths=width * 0.9, patch_artist=True,
+                             showfliers=False, manage_ticks=False)
+            for patch in artists['boxes']:
+                patch.set_facecolor(colors[i])
+            ax.plot([], [], 's', color=colors[i], label=subject)
+        ax.set_xticks(range(len(hometowns)))
+        ax.set_xticklabels(hometowns, rotation=45, ha='right')
+        ax.set_xlabel('Hometown', fontsize=11)
+        ax.set_ylabel('Score', fontsize=11)
+        ax.set_title('Score Distribution by Hometown (Boxplot)', fontsize=12, fontweight='bold')
+        ax.legend(title='Subject')
+    elif kind == 'density':
+        mesh = ax.pcolormesh(data['x_edges'], data['y_edges'], np.ma.masked_invalid(data['literature_mean']).T,
+                             cmap='viridis')
+        ax.plot([data['low'], data['high']], [data['low'], data['high']], 'r--', alpha=0.5, label='Perfect Correlation')
+        ax.set_xlabel('Math Score', fontsize=11)
+        ax.set_ylabel('English Score', fontsize=11)
+        ax.set_title('Math vs English Score (binned)\n(Color = mean Literature Score)', fontsize=12, fontweight='bold')
+        ax.legend()
+        ax.grid(True, alpha=0.3)
+        fig.colorbar(mesh, ax=ax).set_label('Literature Score', fontsize=10)
+    elif kind == 'passed':
+        total = data['total']
+        bars = ax.bar(data['subjects'], data['counts'], color=['#FF6B6B', '#4ECDC4', '#45B7D1'],
+                      edgecolor='black', linewidth=1.5)
+        for bar, count in zip(bars, data['counts']):
+            percentage = count / total * 100 if total else 0.0
+            ax.text(bar.get_x() + bar.get_width() / 2., bar.get_height(), f'{count}\n({percentage:.1f}%)',
+                    ha='center', va='bottom', fontweight='bold', fontsize=10)
+        ax.set_ylabel('Number of Students', fontsize=11)
+        ax.set_title('Students with Score >= 7 (Pass Threshold)', fontsize=12, fontweight='bold')
+        ax.set_ylim(0, max(total, 1) * 1.15)
+        ax.grid(True, alpha=0.3, axis='y')
+    fig.tight_layout()
+    fig.canvas.draw()
+    image = np.asarray(fig.canvas.buffer_rgba()).copy()
+    plt.close(fig)
+    return image
 
 
 def main():
     """Main execution flow."""
+    parser = argparse.ArgumentParser(description="Crawl students, clean scores, export CSV and charts")
+    parser.add_argument("--mode", choices=["ui", "api"], default="ui",
+                        help="ui drives Chrome through the frontend; api calls the backend directly")
+    parser.add_argument("--frontend-url", default="http://localhost:5173")
+    parser.add_argument("--api-url", default="http://localhost:8000")
+    parser.add_argument("--page-size", type=int, default=None, help="rows per page (ui: 10, api: 100)")
+    parser.add_argument("--concurrency", type=int, default=8, help="api mode: requests in flight")
+    parser.add_argument("--retries", type=int, default=3, help="api mode: retries per page")
+    parser.add_argument("--workers", type=int, default=1, help="ui mode: headless browsers crawling in parallel")
+    parser.add_argument("--incremental", action="store_true",
+                        help="api mode: fetch only students changed since the last run and merge into the snapshot")
+    parser.add_argument("--overlap", type=float, default=60,
+                        help="incremental mode: seconds re-read before the watermark")
+    parser.add_argument("--chunk-size", type=int, default=CLEAN_CHUNK_SIZE, help="students per cleaning chunk")
+    parser.add_argument("--profile-memory", action="store_true",
+                        help="report peak memory of the cleaning step (tracemalloc, much slower)")
+    parser.add_argument("--vis-mode", choices=["auto", "exact", "aggregate"], default="auto",
+                        help=f"exact plots every student; auto switches to aggregate above {EXACT_VIS_MAX_ROWS} students")
+    parser.add_argument("--vis-workers", type=int, default=4, help="aggregate mode: chart rendering processes")
+    args = parser.parse_args()
     
     print("Student Data Crawler & Visualizer")
     print("="*60)
     
-    crawler = StudentDataCrawler(frontend_url="http://localhost:5173")
+    crawler = StudentDataCrawler(frontend_url=args.frontend_url, api_url=args.api_url)
     
-    # Step 1: Fetch data from WEBSITE
-    success = crawler.fetch_all_students(page_size=10)
+    # Step 1: Fetch data from WEBSITE (or the API behind it)
+    if args.mode == "api" and args.incremental:
+        success = crawler.fetch_changed_students_api(state_dir="../output", overlap_seconds=args.overlap,
+                                                     page_size=args.page_size or API_MAX_PAGE_SIZE,
+                                                     concurrency=args.concurrency, retries=args.retries)
+    elif args.mode == "api":
+        success = crawler.fetch_all_students_api(page_size=args.page_size or API_MAX_PAGE_SIZE,
+                                                 concurrency=args.concurrency, retries=args.retries)
+    elif args.workers > 1:
+        success = crawler.fetch_all_students_parallel(workers=args.workers)
+    else:
+        success = crawler.fetch_all_students(page_size=args.page_size or 10)
     if not success or len(crawler.all_students) == 0:
         print("Failed to fetch students. Exiting.")
         return
     
-    # Step 2: Clean data
-    df_cleaned = crawler.clean_data()
-    
-    # Step 3: Export to CSV
-    csv_path = crawler.export_to_csv(df_cleaned, output_dir="../output")
+    # Step 2 and 3: Clean data in chunks, writing the cleaned CSV and the chart aggregates as it goes
+    csv_path = crawler.export_path(output_dir="../output")
+    aggregates = crawler.clean_data(chunk_size=args.chunk_size, output_path=csv_path,
+                                    profile_memory=args.profile_memory, release_input=True)
     
     # Step 4: Generate visualizations
-    crawler.generate_visualizations(df_cleaned, output_dir="../output")
+    crawler.generate_visualizations(aggregates, output_dir="../output", mode=args.vis_mode,
+                                    workers=args.vis_workers, csv_path=csv_path)
     
     print("\nAll tasks completed successfully!")
     print(f"Check 'crawler/output' for results:")
-    print(f"   - students_cleaned_{current_time}.csv")
-    print(f"   - student_visualizations_{current_time}.png")
+    print(f"   - {os.path.basename(csv_path)}")
+    print(f"   - student_visualizations_*.png")
 
 
 if __name__ == "__main__":
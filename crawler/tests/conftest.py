@@ -0,0 +1,74 @@
+"""Shared fixtures: a stand-in for the backend's /students/list served on a local port."""
+import asyncio
+import socket
+import threading
+import time
+from typing import Dict, List, Optional
+
+import pytest
+import uvicorn
+from fastapi import FastAPI, Query
+from fastapi.responses import JSONResponse
+
+
+def make_students(n: int) -> List[Dict]:
+    return [{'student_id': f"SV{i:04d}", 'first_name': f"First{i}", 'last_name': f"Last{i}",
+             'email': f"student{i}@example.com", 'dob': "2005-01-31", 'hometown': "Hanoi",
+             'math_score': 7.5, 'english_score': None if i % 4 == 0 else 8.0, 'literature_score': 6.5,
+             'version': 1, 'updated_at': "2026-01-01T00:00:00+00:00"} for i in range(n)]
+
+
+def students_app(students: List[Dict], statuses: Optional[Dict[int, List[int]]] = None, delay: float = 0.0):
+    """/students/list over `students` in the backend's envelope.
+
+    statuses maps a page number to the HTTP statuses its first requests get
+    before it succeeds. app.state records the requests and the most in flight.
+    """
+    app = FastAPI()
+    app.state.requests, app.state.in_flight, app.state.max_in_flight = [], 0, 0
+    statuses = {page: list(codes) for page, codes in (statuses or {}).items()}
+
+    @app.get("/students/list")
+    async def list_students(page: int = 1, page_size: int = Query(10, le=100), sort_field: Optional[str] = None,
+                            fields: Optional[str] = None):
+        app.state.requests.append({'page': page, 'page_size': page_size, 'sort_field': sort_field})
+        app.state.in_flight += 1
+        app.state.max_in_flight = max(app.state.max_in_flight, app.state.in_flight)
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            app.state.in_flight -= 1
+        if statuses.get(page):
+            status = statuses[page].pop(0)
+            return JSONResponse({'success': False, 'error': [f"HTTP {status}"]}, status_code=status)
+        rows = students[(page - 1) * page_size:page * page_size]
+        if fields:
+            rows = [{name: row[name] for name in fields.split(',')} for row in rows]
+        return {'success': True, 'error': None, 'data': rows, 'total_records': len(students)}
+
+    return app
+
+
+@pytest.fixture
+def serve():
+    """serve(app) runs app with uvicorn on a free local port and returns its base URL."""
+    running = []
+
+    def start(app) -> str:
+        sock = socket.socket()
+        sock.bind(("127.0.0.1", 0))
+        server = uvicorn.Server(uvicorn.Config(app, log_level="warning"))
+        thread = threading.Thread(target=server.run, kwargs={'sockets': [sock]}, daemon=True)
+        thread.start()
+        deadline = time.monotonic() + 10
+        while not server.started:
+            if time.monotonic() > deadline:
+                raise RuntimeError("test server did not start")
+            time.sleep(0.01)
+        running.append((server, thread))
+        return f"http://127.0.0.1:{sock.getsockname()[1]}"
+
+    yield start
+    for server, thread in running:
+        server.should_exit = True
+        thread.join(timeout=5)
@@ -0,0 +1,61 @@
+from typing import Dict, List, Tuple
+
+from craw_student import STUDENT_FIELDS, StudentDataCrawler
+from tests.conftest import make_students, students_app
+
+
+def crawl(base_url: str, **options) -> Tuple[bool, List[Dict]]:
+    """fetch_all_students_api against base_url without backoff sleeps: (success, all_students)."""
+    crawler = StudentDataCrawler(api_url=base_url)
+    ok = crawler.fetch_all_students_api(**{'backoff': 0, **options})
+    return ok, crawler.all_students
+
+
+def test_fetches_every_page_in_order(serve):
+    source = make_students(250)
+    app = students_app(source)
+    ok, students = crawl(serve(app), page_size=100)
+    assert ok
+    assert students == [{field: student[field] for field in STUDENT_FIELDS} for student in source]
+    assert sorted(request['page'] for request in app.state.requests) == [1, 2, 3]
+    assert {request['sort_field'] for request in app.state.requests} == {'student_id'}
+
+
+def test_page_size_is_capped_at_the_api_limit(serve):
+    app = students_app(make_students(150))
+    ok, students = crawl(serve(app), page_size=500)
+    assert ok and len(students) == 150
+    assert {request['page_size'] for request in app.state.requests} == {100}
+
+
+def test_concurrency_bounds_requests_in_flight(serve):
+    app = students_app(make_students(1000), delay=0.02)
+    ok, students = crawl(serve(app), page_size=50, concurrency=3)
+    assert ok and len(students) == 1000
+    assert 1 < app.state.max_in_flight <= 3
+
+
+def test_retries_transient_statuses(serve):
+    app = students_app(make_students(30), statuses={2: [503, 429]})
+    ok, students = crawl(serve(app), page_size=10, retries=2)
+    assert ok and len(students) == 30
+    assert [request['page'] for request in app.state.requests].count(2) == 3
+
+
+def test_fails_once_retries_are_exhausted(serve):
+    app = students_app(make_students(30), statuses={3: [500, 500]})
+    ok, students = crawl(serve(app), page_size=10, retries=1)
+    assert not ok
+    assert students == []
+
+
+def test_other_errors_are_not_retried(serve):
+    app = students_app(make_students(30), statuses={2: [404]})
+    ok, students = crawl(serve(app), page_size=10, retries=3)
+    assert not ok
+    assert [request['page'] for request in app.state.requests].count(2) == 1
+
+
+def test_empty_table(serve):
+    ok, students = crawl(serve(students_app([])))
+    assert ok and students == []
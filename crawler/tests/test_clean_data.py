@@ -0,0 +1,109 @@
+import os
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import craw_student
+from craw_student import SCORE_FIELDS, STUDENT_FIELDS, StudentDataCrawler
+
+
+def raw_students(n: int, seed: int = 7):
+    rng = np.random.default_rng(seed)
+    hometowns = ["Hanoi", "Hue", "Da Nang", None]
+    students = []
+    for i in range(n):
+        student = {'student_id': f"SV{i:05d}", 'first_name': "First", 'last_name': "Last",
+                   'email': f"s{i}@example.com", 'dob': "2005-01-31", 'hometown': hometowns[i % 4]}
+        for col in SCORE_FIELDS:
+            # Scores arrive as text from the UI; some are missing
+            student[col] = None if rng.random() < 0.2 else f"{rng.integers(0, 41) / 4:.2f}"
+        students.append(student)
+    return students
+
+
+def crawler_with(students) -> StudentDataCrawler:
+    crawler = StudentDataCrawler()
+    crawler.all_students = list(students)
+    return crawler
+
+
+def test_fills_from_hometown_means_then_the_overall_mean(tmp_path):
+    students = [
+        {'student_id': "SV1", 'hometown': "Hanoi", 'math_score': "8", 'english_score': "6", 'literature_score': None},
+        {'student_id': "SV2", 'hometown': "Hanoi", 'math_score': None, 'english_score': "7", 'literature_score': None},
+        {'student_id': "SV3", 'hometown': "Hue", 'math_score': "4", 'english_score': None, 'literature_score': "5"},
+        {'student_id': "SV4", 'hometown': None, 'math_score': None, 'english_score': None, 'literature_score': None},
+    ]
+    output = tmp_path / "cleaned.csv"
+    aggregates = crawler_with(students).clean_data(chunk_size=2, output_path=str(output))
+    cleaned = pd.read_csv(output).set_index('student_id')
+    assert list(cleaned.columns) == ['hometown', 'math_score', 'english_score', 'literature_score']
+    assert cleaned.loc["SV2", 'math_score'] == 8.0
+    # Hue has no english score, Hanoi no literature score: overall means
+    assert cleaned.loc["SV3", 'english_score'] == 6.5
+    assert cleaned.loc["SV1", 'literature_score'] == 5.0
+    assert cleaned.loc["SV4"].tolist()[1:] == [6.0, 6.5, 5.0]
+    assert aggregates.rows == 4
+
+
+def test_chunking_does_not_change_the_output(tmp_path):
+    students = raw_students(503)
+    small, whole = tmp_path / "small.csv", tmp_path / "whole.csv"
+    chunked = crawler_with(students).clean_data(chunk_size=50, output_path=str(small))
+    single = crawler_with(students).clean_data(chunk_size=10_000, output_path=str(whole))
+    assert small.read_text() == whole.read_text()
+    for (kind, left), (_, right) in zip(chunked.panels(), single.panels()):
+        if kind == 'boxplot':
+            assert left == right
+    assert chunked.passed == single.passed
+    assert all((chunked.histogram[col] == single.histogram[col]).all() for col in SCORE_FIELDS)
+    assert np.array_equal(chunked.density_counts, single.density_counts)
+
+
+def test_aggregates_match_the_cleaned_rows(tmp_path):
+    output = tmp_path / "cleaned.csv"
+    aggregates = crawler_with(raw_students(2000)).clean_data(chunk_size=300, output_path=str(output))
+    cleaned = pd.read_csv(output)
+    panels = dict(aggregates.panels())
+    assert panels['passed']['total'] == len(cleaned) == 2000
+    assert panels['passed']['counts'] == [int((cleaned[col] >= 7).sum()) for col in SCORE_FIELDS]
+    assert sum(counts.sum() for counts in panels['histogram']['counts'].values()) == 3 * 2000
+    for box in panels['boxplot']['boxes']:
+        col = {label: col for col, label in craw_student.SUBJECT_LABELS.items()}[box['subject']]
+        values = cleaned.loc[cleaned['hometown'] == box['hometown'], col]
+        # Within a fine bin of the data values either side of the quantile, plus the CSV's rounding
+        for key, q in (('q1', 0.25), ('med', 0.5), ('q3', 0.75)):
+            assert values.quantile(q, interpolation='lower') - 0.06 <= box[key] \
+                <= values.quantile(q, interpolation='higher') + 0.06
+
+
+def test_release_input_consumes_all_students(tmp_path):
+    crawler = crawler_with(raw_students(120))
+    aggregates = crawler.clean_data(chunk_size=50, release_input=True)
+    assert aggregates.rows == 120
+    assert crawler.all_students == []
+
+
+def test_memory_profiling_is_opt_in(monkeypatch, capsys):
+    def refuse():
+        raise AssertionError("tracemalloc started without profile_memory")
+
+    monkeypatch.setattr(craw_student.tracemalloc, 'start', refuse)
+    crawler_with(raw_students(10)).clean_data()
+    assert "peak memory" not in capsys.readouterr().out
+    monkeypatch.undo()
+    crawler_with(raw_students(10)).clean_data(profile_memory=True)
+    assert "peak memory" in capsys.readouterr().out
+    assert not tracemalloc.is_tracing()
+
+
+@pytest.mark.parametrize("mode", ["aggregate", "exact"])
+def test_generate_visualizations(tmp_path, mode):
+    output = tmp_path / "cleaned.csv"
+    crawler = crawler_with(raw_students(200))
+    aggregates = crawler.clean_data(output_path=str(output))
+    path = crawler.generate_visualizations(aggregates, output_dir=str(tmp_path), mode=mode, workers=2,
+                                           csv_path=str(output))
+    assert os.path.getsize(path) > 0
@@ -0,0 +1,62 @@
+from urllib.parse import parse_qs, urlsplit
+
+from craw_student import StudentDataCrawler
+
+TOTAL_PAGES = 9
+
+
+class FakeButton:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def get_attribute(self, name):
+        return 'true' if self.driver.page >= TOTAL_PAGES else None
+
+    def click(self):
+        self.driver.clicks += 1
+        self.driver.page += 1
+
+
+class FakeDriver:
+    """StudentPage as the crawler sees it: ?page=N, the table snapshot and the Next button."""
+
+    def __init__(self, log):
+        self.page, self.clicks, self.log = None, 0, log
+
+    def get(self, url):
+        self.page = int(parse_qs(urlsplit(url).query).get('page', ['1'])[0])
+        self.log.append(('get', url))
+
+    def execute_script(self, script):
+        rows = [[f"SV{self.page:02d}{i}", "First", "Last", "a@example.com", "2005-01-31", "Hanoi", "7", "8", "9"]
+                for i in range(3)]
+        return {'page': self.page, 'total': TOTAL_PAGES, 'rows': rows}
+
+    def find_element(self, by, value):
+        return FakeButton(self)
+
+    def quit(self):
+        self.log.append(('clicks', self.clicks))
+
+
+def test_page_url_keeps_the_frontend_query():
+    crawler = StudentDataCrawler(frontend_url="http://localhost:5173/?lang=vi&page=2")
+    assert crawler._page_url(7) == "http://localhost:5173/?lang=vi&page=7"
+    assert StudentDataCrawler()._page_url(1) == "http://localhost:5173?page=1"
+
+
+def test_workers_open_their_first_page_directly(monkeypatch):
+    crawler = StudentDataCrawler(frontend_url="http://frontend")
+    logs = []
+
+    def create_driver(headless=False):
+        logs.append([])
+        return FakeDriver(logs[-1])
+
+    monkeypatch.setattr(crawler, '_create_driver', create_driver)
+    assert crawler.fetch_all_students_parallel(workers=3)
+    assert [student['student_id'] for student in crawler.all_students][::3] == [f"SV{page:02d}0" for page in range(1, 10)]
+    gets = sorted(url for log in logs for kind, url in log if kind == 'get')
+    assert gets == sorted(["http://frontend?page=1"] * 3 + ["http://frontend?page=4", "http://frontend?page=7"])
+    # Two clicks per three-page range, none to reach the range
+    assert [value for log in logs for kind, value in log if kind == 'clicks'] == [2, 2, 2]
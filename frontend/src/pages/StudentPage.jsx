@@ -47,7 +47,8 @@ const StudentPage = () => {
   // --- STATE MANAGEMENT ---
   // Dữ liệu danh sách sinh viên và phân trang
   const [students, setStudents] = useState([]);
-  const [page, setPage] = useState(1);
+  // ?page=N mở thẳng trang N (crawler UI song song dùng để nhảy tới dải trang của mình)
+  const [page, setPage] = useState(() => Math.max(1, parseInt(new URLSearchParams(window.location.search).get('page'), 10) || 1));
   const [totalPages, setTotalPages] = useState(1);
   const [loading, setLoading] = useState(false);
 